@@ -1,8 +1,31 @@
 # src/my_db_library/__init__.py
-from .core.config import settings
-from .core.database import connection, init_db
+from .core.config import get_settings
+from .core.database import (
+    connection,
+    get_db_dependency,
+    init_db,
+    ping,
+    setup_event_loop,
+)
 from .models.base_model import Base
 from .repositories.abstract_repo import BaseRepository
 
 __version__ = "0.1.4"
-__all__ = ["settings", "connection", "init_db", "Base", "BaseRepository"]
+__all__ = [
+    "settings",
+    "get_settings",
+    "connection",
+    "get_db_dependency",
+    "init_db",
+    "ping",
+    "setup_event_loop",
+    "Base",
+    "BaseRepository",
+]
+
+
+def __getattr__(name):
+    # settings создаются лениво при первом обращении
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
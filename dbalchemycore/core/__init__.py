@@ -1,5 +1,26 @@
 # src/my_db_library/core/__init__.py
-from .config import settings
-from .database import connection, init_db
+from .config import get_settings
+from .database import (
+    connection,
+    get_db_dependency,
+    init_db,
+    ping,
+    setup_event_loop,
+)
 
-__all__ = ["settings", "connection", "init_db"]
+__all__ = [
+    "settings",
+    "get_settings",
+    "connection",
+    "get_db_dependency",
+    "init_db",
+    "ping",
+    "setup_event_loop",
+]
+
+
+def __getattr__(name):
+    # settings создаются лениво при первом обращении
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,10 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from functools import wraps
-from typing import AsyncGenerator, Optional
+from functools import cache, wraps
+from typing import AsyncGenerator, Optional, Set
 
-from sqlalchemy import text
+from sqlalchemy import URL, Table, event, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -11,77 +12,170 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
 
 from dbalchemycore.models.base_model import Base
 
-from .config import settings
+from .config import get_settings
 
 
 logger = logging.getLogger(__name__)
+_sql_logger = logging.getLogger(f"{__name__}.sql")
+
+# Проверочный запрос для health-check: один TextClause на процесс
+PING_STMT = text("SELECT 1")
+
+# Уровни изоляции, которые принимают execution_options SQLAlchemy
+ISOLATION_LEVELS = frozenset(
+    {
+        "SERIALIZABLE",
+        "REPEATABLE READ",
+        "READ COMMITTED",
+        "READ UNCOMMITTED",
+        "AUTOCOMMIT",
+    }
+)
 
 
-_engine: Optional[AsyncEngine] = None
-_async_sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+def _log_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    """
+    Логирует SQL-запрос перед выполнением (обработчик before_cursor_execute).
+    В отличие от echo=True не строит repr параметров на каждый запрос.
+    """
+    if _sql_logger.isEnabledFor(logging.DEBUG):
+        _sql_logger.debug("%s", statement)
 
 
-def _make_engine() -> AsyncEngine:
+@cache
+def get_engine() -> AsyncEngine:
     """
     Создает и возвращает асинхронный движок для работы с базой данных.
     Инициализирует движок с настройками из конфигурации, использует пул соединений.
+    Результат кэшируется: движок и его пул соединений создаются один раз
+    на процесс и разделяются get_session, get_db_dependency и connection.
+    Функция синхронная и не содержит await, поэтому конкурентные корутины
+    одного event loop не могут создать второй движок.
 
     Returns:
         AsyncEngine: Асинхронный движок SQLAlchemy для подключения к БД.
     """
-    global _engine
-    if _engine is not None:
-        return _engine
-
-    url = settings.sqlalchemy_url
-
-    connect_args = {"command_timeout": settings.DB_CONNECT_TIMEOUT}
-
-    _engine = create_async_engine(
-        url,
-        echo=settings.DB_ECHO,
-        pool_size=settings.DB_POOL_SIZE,
-        max_overflow=settings.DB_MAX_OVERFLOW,
-        connect_args=connect_args,
-        future=True,
-    )
+    settings = get_settings()
+    url = settings.sqlalchemy_url_obj
+
+    if settings.DB_DIALECT == "sqlite":
+        sqlite_args = {}
+        if _is_sqlite_memory(url):
+            # Одно разделяемое соединение: иначе каждая выдача из пула
+            # открывает новую пустую in-memory БД. Файловая БД остается
+            # на пуле по умолчанию, чтобы вызовы не делили одно соединение
+            sqlite_args = {
+                "poolclass": StaticPool,
+                "connect_args": {"check_same_thread": False},
+            }
+        engine = create_async_engine(
+            url,
+            **sqlite_args,
+            query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        )
+    else:
+        connect_args = {
+            "command_timeout": settings.DB_CONNECT_TIMEOUT,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "jit": "on" if settings.DB_JIT else "off",
+                "application_name": settings.DB_APPLICATION_NAME,
+            },
+        }
+
+        if settings.DB_POOL_CLASS == "null":
+            # Соединение открывается на каждый checkout и закрывается при
+            # возврате: пулом управляет внешний PgBouncer
+            pool_args = {"poolclass": NullPool}
+        else:
+            pool_args = {
+                "pool_size": settings.DB_POOL_SIZE,
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                "pool_timeout": settings.DB_POOL_TIMEOUT,
+                "pool_use_lifo": settings.DB_POOL_USE_LIFO,
+            }
+
+        engine = create_async_engine(
+            url,
+            **pool_args,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            connect_args=connect_args,
+            query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+            future=True,
+        )
+
+    if settings.DB_ECHO:
+        event.listen(
+            engine.sync_engine, "before_cursor_execute", _log_cursor_execute
+        )
 
     logger.info(
-        "Движок базы данных инициализирован для БД %s+%s://...",
+        "Движок базы данных инициализирован для БД %s+%s://..., пул: %s",
         settings.DB_DIALECT,
         settings.DB_DRIVER,
+        engine.pool.status(),
+    )
+    return engine
+
+
+def _is_sqlite_memory(url: URL) -> bool:
+    """
+    Проверяет, указывает ли URL SQLite на БД в памяти.
+
+    Args:
+        url: URL подключения SQLAlchemy
+
+    Returns:
+        bool: True для :memory:, пустого пути или mode=memory в URI
+    """
+    return (
+        url.database in (None, "", ":memory:")
+        or url.query.get("mode") == "memory"
     )
-    return _engine
 
 
-def _make_sessionmaker() -> async_sessionmaker[AsyncSession]:
+@cache
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
     """
     Создает и возвращает фабрику асинхронных сессий.
     Инициализирует sessionmaker с настроенным движком и параметрами сессий.
+    Результат кэшируется: фабрика создается один раз на процесс
+    и привязана к единственному движку из get_engine().
 
     Returns:
         async_sessionmaker[AsyncSession]: Фабрика для создания асинхронных сессий.
     """
-    global _async_sessionmaker
-    if _async_sessionmaker is not None:
-        return _async_sessionmaker
-
-    engine = _make_engine()
-    _async_sessionmaker = async_sessionmaker(
-        bind=engine, expire_on_commit=False, class_=AsyncSession
+    session_maker = async_sessionmaker(
+        bind=get_engine(), expire_on_commit=False, class_=AsyncSession
     )
     logger.debug("Создан асинхронный sessionmaker")
-    return _async_sessionmaker
+    return session_maker
 
 
 @asynccontextmanager
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_session(
+    begin: bool = False,
+) -> AsyncGenerator[AsyncSession, None]:
     """
     Асинхронный контекстный менеджер для получения сессии БД.
-    Автоматически обрабатывает откат транзакций при ошибках и закрытие сессии.
+    Автоматически обрабатывает откат транзакций при ошибках.
+    Сессию закрывает выход из async with фабрики сессий.
+
+    При begin=True сессия отдается уже внутри транзакции: коммит
+    выполняется при выходе из блока, откат - при исключении. Без флага
+    транзакциями управляет вызывающий код (например, несколько коммитов
+    в одной сессии).
+
+    Args:
+        begin: True, если открыть транзакцию с коммитом при выходе
 
     Yields:
         AsyncSession: Асинхронная сессия для работы с базой данных.
@@ -89,74 +183,115 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
     Raises:
         SQLAlchemyError: При возникновении ошибок в работе с БД.
     """
-    session_maker = _make_sessionmaker()
-    async with session_maker() as session:
-        logger.debug("Сессия базы данных создана")
+    if begin:
+        async with get_sessionmaker().begin() as session:
+            yield session
+        return
+
+    async with get_sessionmaker()() as session:
         try:
             yield session
-            logger.debug("Сессия завершена успешно")
         except SQLAlchemyError as exc:
-            logger.debug("Ошибка в сессии: %s", str(exc))
+            logger.debug("Ошибка в сессии: %s", exc)
             try:
                 await session.rollback()
                 logger.debug("Откат транзакции выполнен")
             except SQLAlchemyError as rollback_exc:
                 logger.debug("Ошибка при откате транзакции: %s", rollback_exc)
             raise
-        finally:
-            await session.close()
-            logger.debug("Сессия закрыта")
 
 
 def connection(isolation_level: Optional[str] = None, commit: bool = True):
     """
     Декоратор для управления сессией БД с настройкой уровня изоляции и коммита.
     Обеспечивает автоматическое создание сессии, коммит и откат транзакций.
+    Если сессия передана явно (session=...), метод вызывается с ней
+    напрямую: транзакцией, коммитом и уровнем изоляции управляет
+    вызывающий код.
 
     Args:
         isolation_level: Уровень изоляции транзакции (например, "SERIALIZABLE").
+            Регистр и "_" вместо пробела не важны: "read_committed"
+            приводится к "READ COMMITTED".
         commit: Флаг необходимости коммита после выполнения метода.
 
     Returns:
         Декорированную функцию с управлением сессией.
+
+    Raises:
+        ValueError: Если уровень изоляции не входит в ISOLATION_LEVELS.
     """
+    if isolation_level is not None:
+        # Дальше, в execution_options, уходит уже нормализованное значение
+        isolation_level = isolation_level.upper().replace("_", " ")
+        if isolation_level not in ISOLATION_LEVELS:
+            raise ValueError(
+                f"Неизвестный уровень изоляции {isolation_level!r}, "
+                f"допустимые: {', '.join(sorted(ISOLATION_LEVELS))}"
+            )
 
     def decorator(method):
-        @wraps(method)
-        async def wrapper(*args, **kwargs):
-            async with _async_sessionmaker() as session:
-                logger.debug("Сессия создана в декораторе connection")
-                try:
-                    if isolation_level:
-                        await session.execute(
-                            text(
-                                f"SET TRANSACTION ISOLATION LEVEL {isolation_level}"
-                            )
-                        )
-                        logger.debug(
-                            "Установлен уровень изоляции: %s", isolation_level
-                        )
-
-                    result = await method(*args, session=session, **kwargs)
-
-                    if commit:
-                        await session.commit()
-                        logger.debug("Транзакция закоммичена")
-
-                    return result
-                except SQLAlchemyError as exc:
-                    logger.debug("Ошибка в транзакции: %s", str(exc))
+        # Фабрика сессий резолвится при первом вызове, а не при декорировании:
+        # методы репозиториев декорируются на импорте, до вызова init_db
+        session_maker = None
+        isolation_options = (
+            {"isolation_level": isolation_level} if isolation_level else None
+        )
+
+        async def set_isolation(session: AsyncSession) -> None:
+            # Уровень выставляется на DBAPI-соединении и уходит
+            # вместе с BEGIN, без отдельного SET TRANSACTION
+            await session.connection(execution_options=isolation_options)
+            logger.debug("Установлен уровень изоляции: %s", isolation_level)
+
+        # Вариант обертки выбирается при декорировании, а не на каждом вызове
+        if commit:
+
+            @wraps(method)
+            async def wrapper(
+                *args, session: Optional[AsyncSession] = None, **kwargs
+            ):
+                if session is not None:
+                    return await method(*args, session=session, **kwargs)
+
+                nonlocal session_maker
+                if session_maker is None:
+                    session_maker = get_sessionmaker()
+                # Не session_maker.begin(): метод может сам вызвать
+                # session.commit() и продолжить работу в новой транзакции,
+                # поэтому коммитится только еще открытая транзакция
+                async with session_maker() as session:
                     try:
+                        if isolation_options is not None:
+                            await set_isolation(session)
+                        result = await method(*args, session=session, **kwargs)
+                        if session.in_transaction():
+                            await session.commit()
+                            logger.debug("Транзакция закоммичена")
+                        return result
+                    except Exception:
                         await session.rollback()
                         logger.debug("Откат транзакции выполнен")
-                    except SQLAlchemyError as rollback_exc:
-                        logger.debug(
-                            "Ошибка при откате: %s", str(rollback_exc)
-                        )
-                    raise
-                finally:
-                    await session.close()
-                    logger.debug("Сессия в декораторе закрыта")
+                        raise
+
+        else:
+
+            @wraps(method)
+            async def wrapper(
+                *args, session: Optional[AsyncSession] = None, **kwargs
+            ):
+                if session is not None:
+                    return await method(*args, session=session, **kwargs)
+
+                nonlocal session_maker
+                if session_maker is None:
+                    session_maker = get_sessionmaker()
+                # Выход из async with закрывает сессию, незакоммиченная
+                # транзакция при этом откатывается
+                async with session_maker() as session:
+                    if isolation_options is not None:
+                        await set_isolation(session)
+                    return await method(*args, session=session, **kwargs)
 
         return wrapper
 
@@ -167,30 +302,173 @@ async def get_db_dependency() -> AsyncGenerator[AsyncSession, None]:
     """
     Генератор зависимости для FastAPI, предоставляющий сессию БД.
     Используется как dependency injection в FastAPI роутах.
+    Сессия открывается напрямую из фабрики, без промежуточного
+    контекстного менеджера get_session.
 
     Yields:
         AsyncSession: Асинхронная сессия для работы с базой данных.
     """
-    async with get_session() as session:
-        logger.debug("Сессия создана для зависимости FastAPI")
+    async with get_sessionmaker()() as session:
+        try:
+            yield session
+        except SQLAlchemyError as exc:
+            logger.debug("Ошибка в сессии: %s", exc)
+            await session.rollback()
+            raise
+
+
+async def ping() -> bool:
+    """
+    Проверяет доступность базы данных запросом PING_STMT.
+    Использует соединение из пула без сессии ORM, подходит для
+    health-check эндпоинтов.
+
+    Returns:
+        bool: True, если БД ответила на SELECT 1
+
+    Raises:
+        SQLAlchemyError: Если соединение с БД установить не удалось.
+    """
+    async with get_engine().connect() as conn:
+        result = await conn.execute(PING_STMT)
+        return result.scalar() == 1
+
+
+def setup_event_loop() -> bool:
+    """
+    Устанавливает uvloop в качестве политики цикла событий asyncio.
+    Должна вызываться до asyncio.run() (или до запуска uvicorn/gunicorn),
+    так как init_db выполняется уже внутри работающего цикла.
+    Все циклы, созданные через asyncio.run(), будут использовать uvloop.
+
+    Returns:
+        bool: True, если uvloop установлен, False, если пакет недоступен
+    """
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning(
+            "uvloop не установлен, используется стандартный цикл asyncio"
+        )
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Политика цикла событий uvloop установлена")
+    return True
+
+
+# Ключи таблиц, для которых init_db уже выполнил create_all в этом процессе
+_created_tables: Set[str] = set()
+
+
+def _forget_created_tables(engine) -> None:
+    """
+    Сбрасывает учет созданных таблиц при dispose движка.
+
+    Args:
+        engine: Синхронный движок, пул которого закрыт
+    """
+    _created_tables.clear()
+    logger.debug("Учет созданных таблиц сброшен после dispose движка")
 
-        yield session
 
+@event.listens_for(Table, "after_drop")
+def _forget_dropped_table(table: Table, connection, **kw) -> None:
+    """
+    Убирает удаленную таблицу из учета созданных таблиц, чтобы следующий
+    init_db(use_create_all=True) создал ее снова. Срабатывает и для
+    table.drop(), и для каждой таблицы в metadata.drop_all().
 
-async def init_db(use_create_all: bool = False) -> None:
+    Args:
+        table: Удаленная таблица
+        connection: Соединение, через которое выполнен DROP
+    """
+    _created_tables.discard(table.key)
+
+
+@cache
+def _init_lock() -> asyncio.Lock:
+    """
+    Возвращает блокировку, сериализующую конкурентные вызовы init_db
+    (например, из lifespan и фоновой задачи прогрева).
+    Создается лениво, внутри работающего цикла событий.
+    """
+    return asyncio.Lock()
+
+
+async def _warm_up_pool(engine: AsyncEngine) -> None:
+    """
+    Заранее открывает pool.size() соединений пула и сразу возвращает их в пул.
+    Размер берется из самого пула, поэтому движок с pool_size, отличным
+    от DB_POOL_SIZE, прогревается полностью. Другие классы пулов (NullPool,
+    StaticPool) не прогреваются.
+    Используется engine.connect(), а не begin(), чтобы не открывать транзакцию.
+
+    Args:
+        engine: Асинхронный движок, пул которого прогревается
+    """
+    if not isinstance(engine.pool, QueuePool):
+        return
+
+    size = engine.pool.size()
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(size)), return_exceptions=True
+    )
+    connections = [r for r in results if not isinstance(r, BaseException)]
+    await asyncio.gather(*(conn.close() for conn in connections))
+
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    logger.debug("Пул прогрет, открыто %d соединений", len(connections))
+
+
+async def init_db(
+    use_create_all: bool = False, warm_up_pool: bool = True
+) -> None:
     """
     Инициализация engine и sessionmaker для работы с БД
-    При True флага use_create_all - создание таблиц по Metadata, используя Base.metadata.create_all
+    При True флага use_create_all - создание таблиц по Metadata, используя Base.metadata.create_all.
+    Таблицы, уже созданные этим процессом, повторно не проверяются:
+    create_all получает только новые таблицы метаданных, а если таких нет, не вызывается
+    При True флага warm_up_pool - заранее открываются pool.size() соединений,
+    чтобы первые запросы не платили за установку соединения (только для QueuePool)
 
     Args:
         use_create_all: True, если создать таблицы в БД, используя Metadata, по умолчанию False
+        warm_up_pool: True, если прогреть пул соединений, по умолчанию True
     """
-    _make_engine()
-    _make_sessionmaker()
-
-    if use_create_all:
-        async with _engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        logger.info("Таблицы созданы через create_all()")
+    async with _init_lock():
+        engine = get_engine()
+        get_sessionmaker()
+
+        if warm_up_pool:
+            await _warm_up_pool(engine)
+
+        if use_create_all:
+            tables = [
+                table
+                for table in Base.metadata.sorted_tables
+                if table.key not in _created_tables
+            ]
+            if tables:
+                async with engine.begin() as conn:
+                    await conn.run_sync(
+                        Base.metadata.create_all, tables=tables
+                    )
+                _created_tables.update(table.key for table in tables)
+                # После dispose БД может оказаться другой (например, SQLite
+                # в памяти), поэтому учет сбрасывается вместе с пулом
+                if not event.contains(
+                    engine.sync_engine,
+                    "engine_disposed",
+                    _forget_created_tables,
+                ):
+                    event.listen(
+                        engine.sync_engine,
+                        "engine_disposed",
+                        _forget_created_tables,
+                    )
+                logger.info("Таблицы созданы через create_all()")
 
     logger.info("База данных инициализирована успешно")
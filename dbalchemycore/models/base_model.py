@@ -1,22 +1,26 @@
+from datetime import datetime
 from typing import Annotated
 
 from sqlalchemy import DateTime, Integer
 from sqlalchemy.ext.asyncio import AsyncAttrs
-from sqlalchemy.orm import (
-    DeclarativeBase,
-    declared_attr,
-    mapped_column,
-)
+from sqlalchemy.orm import DeclarativeBase, mapped_column
 from sqlalchemy.sql import func
 
 
+# Одно выражение now() на все временные метки: выражения SQLAlchemy
+# неизменяемы и безопасно разделяются между колонками
+_SERVER_NOW = func.now()
+
 # Аннотации для часто используемых полей
 id_field = Annotated[
     int, mapped_column(Integer, primary_key=True, autoincrement=True)
 ]
-created_at = Annotated[DateTime, mapped_column(server_default=func.now())]
+created_at = Annotated[
+    datetime, mapped_column(DateTime, server_default=_SERVER_NOW)
+]
 updated_at = Annotated[
-    DateTime, mapped_column(server_default=func.now(), onupdate=func.now())
+    datetime,
+    mapped_column(DateTime, server_default=_SERVER_NOW, onupdate=_SERVER_NOW),
 ]
 
 
@@ -33,7 +37,35 @@ class Base(DeclarativeBase, AsyncAttrs):
 
     __abstract__ = True
 
-    @declared_attr.directive
-    def __tablename__(cls) -> str:
-        """Автоматически генерирует имя таблицы на основе имени класса."""
-        return cls.__name__.lower() + "s"
+    def __init_subclass__(cls, **kwargs):
+        """
+        Автоматически задает имя таблицы на основе имени класса.
+        Имя вычисляется один раз при создании класса, до маппинга
+        в DeclarativeBase. Имя не задается, если __tablename__ объявлен
+        в самом классе (в том числе как None), приходит из миксина или
+        базового класса, либо базовый класс уже смаплен: в последнем
+        случае подкласс без своей таблицы использует single-table
+        inheritance.
+        """
+        if not _has_table_in_hierarchy(cls):
+            cls.__tablename__ = cls.__name__.lower() + "s"
+        super().__init_subclass__(**kwargs)
+
+
+def _has_table_in_hierarchy(cls: type) -> bool:
+    """
+    Проверяет, определены ли таблица или ее имя для класса модели.
+
+    Args:
+        cls: Класс модели
+
+    Returns:
+        bool: True, если __tablename__ объявлен в классе или в MRO,
+            класс абстрактный или один из базовых классов уже смаплен
+    """
+    if "__tablename__" in cls.__dict__ or cls.__dict__.get("__abstract__"):
+        return True
+    return any(
+        "__tablename__" in base.__dict__ or "__table__" in base.__dict__
+        for base in cls.__mro__[1:]
+    )
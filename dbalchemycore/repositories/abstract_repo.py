@@ -1,23 +1,46 @@
+import datetime
 import logging
 import time
-from typing import Any, Dict, Generic, List, Optional, TypeVar, Union
+import types
+from decimal import Decimal
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    FrozenSet,
+    Generic,
+    Iterable,
+    List,
+    Mapping,
+    NoReturn,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
+from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PlainSerializer, TypeAdapter, WrapSerializer
 from sqlalchemy import (
-    and_,
+    Table,
+    bindparam,
     delete,
-    distinct,
     func,
     insert,
     select,
     text,
     update,
 )
-from sqlalchemy.exc import MultipleResultsFound
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import Select
+from sqlalchemy.exc import DBAPIError, MultipleResultsFound
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.sql import Insert, Select
 
-from dbalchemycore.core.database import connection
+from dbalchemycore.core.database import PING_STMT, connection, get_session
 from dbalchemycore.core.exc import (
     EmptyFilterError,
     EmptyValueError,
@@ -33,6 +56,43 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=Base)
 
+# Размер пачки для executemany INSERT по диалектам: для PostgreSQL
+# прироста после ~1000 строк нет, а пачка держит число параметров
+# ниже лимита протокола
+INSERT_BATCH_SIZE = {"postgresql": 1000, "mysql": 10000, "sqlite": 500}
+DEFAULT_INSERT_BATCH_SIZE = 1000
+
+# Сколько строк execute_sql_iter забирает из курсора за один раз
+STREAM_CHUNK_SIZE = 1000
+
+# Типы полей, значения которых model_dump возвращает без изменений
+_PLAIN_FIELD_TYPES = frozenset(
+    {
+        int,
+        float,
+        str,
+        bool,
+        bytes,
+        Decimal,
+        UUID,
+        datetime.datetime,
+        datetime.date,
+        datetime.time,
+        datetime.timedelta,
+    }
+)
+# Optional[X] и X | None (Python 3.10+)
+_UNION_TYPES = frozenset({Union, getattr(types, "UnionType", Union)})
+
+# Поддерживаемые агрегатные функции для get_many(aggregations=...)
+_AGG_FUNCS = {
+    "count": func.count,
+    "sum": func.sum,
+    "avg": func.avg,
+    "min": func.min,
+    "max": func.max,
+}
+
 
 class BaseRepository(Generic[T]):
     """
@@ -40,7 +100,7 @@ class BaseRepository(Generic[T]):
 
     Предоставляет универсальные методы для работы с БД:
     - Получение данных (get_one, get_many)
-    - Создание записей (create)
+    - Создание записей (create, create_copy)
     - Обновление записей (update)
     - Удаление записей (delete)
     - Выполнение произвольных SQL запросов (execute_sql)
@@ -48,6 +108,12 @@ class BaseRepository(Generic[T]):
 
     model: type[T]
     _model_columns_map: Dict[str, Any] = {}
+    _model_field_set: FrozenSet[str] = frozenset()
+    _model_element_map: Dict[str, Any] = {}
+    _stmt_select_all: Optional[Select] = None
+    _stmt_by_id: Optional[Select] = None
+    _stmt_insert: Optional[Insert] = None
+    _column_order: List[str] = []
 
     @classmethod
     def __init_subclass__(cls, **kwargs):
@@ -66,12 +132,28 @@ class BaseRepository(Generic[T]):
     def _init_model_columns(cls):
         """
         Инициализация маппинга колонок модели с label.
-        Создает словарь {имя_поля: колонка.label(имя_поля)}.
+        Создает словарь {имя_поля: колонка.label(имя_поля)}, множество имен
+        полей и словарь {имя_поля: колонка} без label, а также заранее
+        строит SELECT всех колонок и SELECT по ID с bindparam "pk", чтобы
+        не собирать их заново на каждый вызов. DELETE и UPDATE по ID
+        собираются на вызове: им нужен литеральный WHERE для
+        synchronize_session="evaluate".
         """
         cls._model_columns_map = {
             field: getattr(cls.model, field).label(field)
             for field in cls.model.__table__.columns.keys()
         }
+        cls._model_field_set = frozenset(cls._model_columns_map)
+        cls._model_element_map = {
+            field: column.element
+            for field, column in cls._model_columns_map.items()
+        }
+        cls._stmt_select_all = select(*cls._model_columns_map.values())
+        cls._stmt_insert = insert(cls.model.__table__)
+        cls._column_order = list(cls._model_columns_map)
+        if "id" in cls._model_field_set:
+            by_id = cls.model.id == bindparam("pk")
+            cls._stmt_by_id = cls._stmt_select_all.where(by_id)
         logger.debug(
             "Создан маппинг колонок с %d полями", len(cls._model_columns_map)
         )
@@ -84,11 +166,6 @@ class BaseRepository(Generic[T]):
         Returns:
             Dict[str, Any]: Словарь колонок модели
         """
-        if (
-            not hasattr(cls, "_model_columns_map")
-            or cls._model_columns_map is None
-        ):
-            cls._init_model_columns()
         return cls._model_columns_map
 
     @classmethod
@@ -96,6 +173,7 @@ class BaseRepository(Generic[T]):
     async def execute_sql(cls, stmt: str, session: AsyncSession) -> List[Dict]:
         """
         Выполнить произвольный SQL-запрос и вернуть результат в виде списка словарей.
+        Строки читаются потоком через execute_sql_iter.
 
         Args:
             stmt: SQL-запрос в виде строки
@@ -105,19 +183,81 @@ class BaseRepository(Generic[T]):
             List[Dict]: Список строк, где каждая строка представлена словарем
         """
 
-        start_time = time.time()
+        return [
+            row async for row in cls.execute_sql_iter(stmt, session=session)
+        ]
+
+    @classmethod
+    async def execute_sql_iter(
+        cls,
+        stmt: str,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        session: Optional[AsyncSession] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Выполнить произвольный SQL-запрос и отдавать строки по одной.
+        Результат читается серверным курсором пачками по chunk_size строк,
+        поэтому в памяти не держится вся выборка целиком.
+
+        Без переданной сессии открывает собственную на время итерации
+        и не коммитит ее.
+
+        Args:
+            stmt: SQL-запрос в виде строки
+            chunk_size: Количество строк, забираемых из курсора за раз
+            session: Асинхронная сессия SQLAlchemy
+
+        Yields:
+            Dict: Строка результата в виде словаря
+        """
+
+        if session is None:
+            async with get_session() as own_session:
+                async for row in cls.execute_sql_iter(
+                    stmt, chunk_size=chunk_size, session=own_session
+                ):
+                    yield row
+            return
+
+        start_time = _start_timer()
         logger.debug(
             "Выполнение самописного SQL запроса, длина: %d символов", len(stmt)
         )
 
-        result = await session.execute(text(stmt))
+        result = await session.stream(text(stmt))
+        try:
+            async for partition in result.mappings().partitions(chunk_size):
+                for row in partition:
+                    yield dict(row)
+        finally:
+            await result.close()
 
         logger.debug(
             "SQL выполнен за %.3f сек",
             _count_execute_time(start_time=start_time),
         )
 
-        return [dict(row) for row in result.mappings()]
+    @classmethod
+    async def _get_by_id(
+        cls, id: int, session: AsyncSession
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Получить запись по ID заранее построенным SELECT.
+        Выражение собрано один раз с bindparam "pk", поэтому каждый вызов
+        попадает в одну запись кэша скомпилированных выражений, а ошибки
+        драйвера, логирование и инвалидация соединений остаются за
+        SQLAlchemy.
+
+        Args:
+            id: ID записи
+            session: Асинхронная сессия SQLAlchemy
+
+        Returns:
+            Optional[Dict[str, Any]]: Словарь с данными записи или None
+        """
+        result = await session.execute(cls._stmt_by_id, {"pk": id})
+        mapping = result.mappings().one_or_none()
+        return dict(mapping) if mapping is not None else None
 
     @classmethod
     @connection(commit=False)
@@ -138,7 +278,8 @@ class BaseRepository(Generic[T]):
             filters: Pydantic модель с фильтрами равенства
             select_fields: Список полей для выборки
             order_by: Поле(я) для сортировки. Для DESC добавить префикс '-'
-            strict: Если True, выбросит исключение при множественных результатах
+            strict: Если True, выбросит исключение при множественных
+                результатах. Из БД при этом читается не более двух строк
             session: Асинхронная сессия SQLAlchemy
 
         Returns:
@@ -148,7 +289,7 @@ class BaseRepository(Generic[T]):
             MultipleResultsFound: Если strict=True и найдено более одной записи
         """
 
-        start_time = time.time()
+        start_time = _start_timer()
         logger.debug("Вызов get_one - ID: %s, strict: %s", id, strict)
 
         if (
@@ -158,24 +299,20 @@ class BaseRepository(Generic[T]):
             and order_by is None
         ):
             logger.debug("Оптимизированный путь запроса по ID")
-            columns = list(cls._get_model_columns().values())
-            stmt = select(*columns).where(cls.model.id == id)
-            result = await session.execute(stmt)
-            mapping = result.mappings().one_or_none()
+            mapping = await cls._get_by_id(id, session)
 
             if mapping is None:
                 logger.debug(
-                    "Найдена запись по ID за %.3f сек",
+                    "Запись не найдена по ID за %.3f сек",
                     _count_execute_time(start_time=start_time),
                 )
-                return None
             else:
                 logger.debug(
-                    "Запись не найдена по ID за %.3f сек",
+                    "Найдена запись по ID за %.3f сек",
                     _count_execute_time(start_time=start_time),
                 )
 
-            return dict(mapping)
+            return mapping
 
         query = cls._build_select_query(select_fields)
         if id is not None:
@@ -186,6 +323,8 @@ class BaseRepository(Generic[T]):
             query = cls._apply_ordering(query, order_by)
 
         if strict:
+            # Для проверки уникальности достаточно двух строк
+            query = query.limit(2)
             result = await session.execute(query)
             mappings = result.mappings().all()
             if len(mappings) > 1:
@@ -239,50 +378,16 @@ class BaseRepository(Generic[T]):
             List[Dict]: Список словарей с данными записей
         """
 
-        start_time = time.time()
+        start_time = _start_timer()
         logger.debug(
             "Вызов get_many - лимит: %s, distinct: %s", limit, is_distinct
         )
-        expected_keys = []
 
         if group_by or aggregations:
             logger.debug("Использование группированного запроса")
             query = cls._build_grouped_query(group_by, aggregations)
-            expected_keys = None
         else:
-            if select_fields:
-                if hasattr(cls, "_validate_fields"):
-                    valid_fields = cls._validate_fields(select_fields)
-                else:
-                    model_fields = cls._get_model_columns().keys()
-                    valid_fields = [
-                        field
-                        for field in select_fields
-                        if field in model_fields
-                    ]
-                    if not valid_fields:
-                        raise ValueError(
-                            f"No valid fields found in select_fields: {select_fields}"
-                        )
-
-                columns_map = cls._get_model_columns()
-                columns = [columns_map[field] for field in valid_fields]
-
-                expected_keys = valid_fields
-
-                if is_distinct:
-                    query = select(distinct(*columns))
-                else:
-                    query = select(*columns)
-            else:
-                columns_map = cls._get_model_columns()
-                columns = list(columns_map.values())
-                expected_keys = list(columns_map.keys())
-
-                if is_distinct:
-                    query = select(distinct(*columns))
-                else:
-                    query = select(*columns)
+            query = cls._build_select_query(select_fields, is_distinct)
 
         if filters:
             query = cls._apply_filters(query, filters)
@@ -294,38 +399,18 @@ class BaseRepository(Generic[T]):
             raise ValueError("Group by не был передан, having невозможен")
         if order_by:
             query = cls._apply_ordering(query, order_by)
-        if offset:
-            query = query.offset(offset)
-        if limit:
-            query = query.limit(limit)
+        if limit is not None or offset is not None:
+            query = cls._apply_pagination(query, limit, offset)
 
+        # Все колонки запроса подписаны label, поэтому ключи словарей
+        # совпадают с именами полей (и агрегатов) без доработки
         result = await session.execute(query)
-        rows = result.all()
+        result_dicts = [dict(mapping) for mapping in result.mappings().all()]
         logger.debug(
             "get_many завершен за %.3f сек, найдено %d строк",
             _count_execute_time(start_time=start_time),
-            len(rows),
+            len(result_dicts),
         )
-        if not rows:
-            return []
-
-        if expected_keys is None:
-            if hasattr(rows[0], "_mapping"):
-                expected_keys = list(rows[0]._mapping.keys())
-            else:
-                expected_keys = list(range(len(rows[0]))) if rows[0] else []
-
-        result_dicts = []
-        for row in rows:
-            if hasattr(row, "_mapping"):
-                mapping_dict = dict(row._mapping)
-                if "_no_label" in mapping_dict and len(expected_keys) == 1:
-                    correct_key = expected_keys[0]
-                    mapping_dict[correct_key] = mapping_dict.pop("_no_label")
-
-                result_dicts.append(mapping_dict)
-            else:
-                result_dicts.append(dict(zip(expected_keys, row)))
 
         return result_dicts
 
@@ -345,22 +430,43 @@ class BaseRepository(Generic[T]):
         Returns:
             Select: Скомпилированный SELECT запрос
         """
+        if not select_fields and not use_distinct:
+            return cls._stmt_select_all
+        return cls._cached_select(
+            tuple(select_fields) if select_fields else None, use_distinct
+        )
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _cached_select(
+        cls, select_fields: Optional[tuple], use_distinct: bool
+    ) -> Select:
+        """
+        Построение SELECT запроса с кэшированием по (класс, поля, distinct).
+        Select неизменяем, поэтому закэшированный объект безопасно
+        дополнять через where/order_by/limit.
+
+        Args:
+            select_fields: Кортеж полей для выборки или None для всех полей
+            use_distinct: Использовать DISTINCT
+
+        Returns:
+            Select: SELECT запрос
+
+        Raises:
+            InvalidFieldError: При наличии невалидных полей
+        """
+        columns_map = cls._get_model_columns()
         if select_fields:
-            valid_fields = cls._validate_fields(select_fields)
-            columns_map = cls._get_model_columns()
-            columns = [columns_map[field] for field in valid_fields]
-            if use_distinct:
-                query = select(distinct(*columns))
-            else:
-                query = select(*columns)
+            cls._validate_fields(list(select_fields))
+            columns = _fields_getter(select_fields)(columns_map)
         else:
-            columns_map = cls._get_model_columns()
             columns = list(columns_map.values())
-            if use_distinct:
-                query = select(distinct(*columns))
-            else:
-                query = select(*columns)
 
+        query = select(*columns)
+        if use_distinct:
+            # SELECT DISTINCT col0, col1, ...: сохраняет label колонок
+            query = query.distinct()
         return query
 
     @classmethod
@@ -384,49 +490,28 @@ class BaseRepository(Generic[T]):
             UnknowAggregationFunc: При неизвестной агрегационной функции
         """
         columns = []
+        elements = cls._model_element_map
 
         if group_by:
             if isinstance(group_by, str):
                 group_by = [group_by]
 
             valid_group_fields = cls._validate_fields(group_by)
-            columns_map = cls._get_model_columns()
-            columns.extend(
-                [columns_map[field].element for field in valid_group_fields]
-            )
+            columns.extend(_fields_getter(tuple(valid_group_fields))(elements))
 
         if aggregations:
-            model_fields = cls._get_model_columns().keys()
             for field, func_name in aggregations.items():
-                if field in model_fields:
-                    column = cls._get_model_columns()[field].element
-
-                    if func_name.lower() == "count":
-                        columns.append(
-                            func.count(column).label(f"{field}_{func_name}")
-                        )
-                    elif func_name.lower() == "sum":
-                        columns.append(
-                            func.sum(column).label(f"{field}_{func_name}")
-                        )
-                    elif func_name.lower() == "avg":
-                        columns.append(
-                            func.avg(column).label(f"{field}_{func_name}")
-                        )
-                    elif func_name.lower() == "min":
-                        columns.append(
-                            func.min(column).label(f"{field}_{func_name}")
-                        )
-                    elif func_name.lower() == "max":
-                        columns.append(
-                            func.max(column).label(f"{field}_{func_name}")
-                        )
-                    else:
+                element = elements.get(field)
+                if element is not None:
+                    key = func_name.lower()
+                    agg_func = _AGG_FUNCS.get(key)
+                    if agg_func is None:
                         raise UnknowAggregationFunc(
-                            f"Неизвестная функция агрегации {func_name.lower}"
+                            f"Неизвестная функция агрегации {key}"
                         )
+                    columns.append(agg_func(element).label(f"{field}_{key}"))
             if not columns:
-                columns = list(cls._get_model_columns().values())
+                columns = list(cls._model_columns_map.values())
 
         return select(*columns)
 
@@ -445,7 +530,7 @@ class BaseRepository(Generic[T]):
         conditions = cls._build_conditions(filter=filters)
 
         if conditions:
-            query = query.where(and_(*conditions))
+            query = query.where(*conditions)
 
         return query
 
@@ -466,7 +551,7 @@ class BaseRepository(Generic[T]):
         if isinstance(order_by, str):
             order_by = [order_by]
 
-        model_fields = cls._get_model_columns().keys()
+        elements = cls._model_element_map
 
         for order_field in order_by:
             desc = False
@@ -476,9 +561,8 @@ class BaseRepository(Generic[T]):
                 desc = True
                 order_field = order_field[1:]
 
-            if order_field in model_fields:
-                column = cls._get_model_columns()[order_field].element
-
+            column = elements.get(order_field)
+            if column is not None:
                 if desc:
                     query = query.order_by(column.desc())
                 else:
@@ -486,6 +570,30 @@ class BaseRepository(Generic[T]):
 
         return query
 
+    @classmethod
+    def _apply_pagination(
+        cls, query: Select, limit: Optional[int], offset: Optional[int]
+    ) -> Select:
+        """
+        Применение LIMIT и OFFSET к запросу.
+        Значение 0 применяется как есть: limit=0 дает пустую выборку.
+
+        Args:
+            query: Исходный SELECT запрос
+            limit: Максимальное количество записей или None
+            offset: Смещение для пагинации или None
+
+        Returns:
+            Select: Запрос с примененной пагинацией
+        """
+        if limit is not None and offset is not None:
+            return query.slice(offset, offset + limit)
+        if limit is not None:
+            return query.limit(limit)
+        if offset is not None:
+            return query.offset(offset)
+        return query
+
     @classmethod
     def _apply_grouping(
         cls, query: Select, group_by: Union[str, List[str]]
@@ -503,12 +611,10 @@ class BaseRepository(Generic[T]):
         if isinstance(group_by, str):
             group_by = [group_by]
 
-        group_columns = []
-        model_fields = cls._get_model_columns().keys()
-
-        for field in group_by:
-            if field in model_fields:
-                group_columns.append(cls._get_model_columns()[field].element)
+        elements = cls._model_element_map
+        group_columns = [
+            elements[field] for field in group_by if field in elements
+        ]
 
         if group_columns:
             query = query.group_by(*group_columns)
@@ -529,27 +635,32 @@ class BaseRepository(Generic[T]):
         Returns:
             Select: Запрос с примененными HAVING фильтрами
         """
+        # Пустой model_fields_set означает пустой дамп с exclude_unset
+        if not having_filters.model_fields_set:
+            return query
+
         filter_dict = having_filters.model_dump(exclude_unset=True)
-        having_conditions = []
-        model_fields = cls._get_model_columns().keys()
 
-        for field, value in filter_dict.items():
-            if field in model_fields:
-                column = cls._get_model_columns()[field].element
-                having_conditions.append(column == value)
+        model_fields = cls._model_field_set
+        elements = cls._model_element_map
+        having_conditions = [
+            elements[field] == value
+            for field, value in filter_dict.items()
+            if field in model_fields
+        ]
 
         if having_conditions:
-            query = query.having(and_(*having_conditions))
+            query = query.having(*having_conditions)
 
         return query
 
     @classmethod
-    def _validate_fields(cls, fields: List[str]) -> List[str]:
+    def _validate_fields(cls, fields: Iterable[str]) -> List[str]:
         """
         Валидация существования полей в модели.
 
         Args:
-            fields: Список полей для валидации
+            fields: Поля для валидации (любой итерируемый объект)
 
         Returns:
             List[str]: Список валидных полей
@@ -557,16 +668,20 @@ class BaseRepository(Generic[T]):
         Raises:
             InvalidFieldError: При наличии невалидных полей
         """
-        valid_fields = []
-        model_fields = cls._get_model_columns().keys()
+        # Генератор исчерпался бы на issuperset, и наружу ушел бы пустой
+        # список, поэтому поля материализуются один раз
+        fields = list(fields)
+        model_fields = cls._model_field_set
+        # Проверка подмножества выполняется одной операцией над frozenset,
+        # поэлементный обход нужен только для сообщения об ошибке
+        if model_fields.issuperset(fields):
+            return fields
+
         for field in fields:
-            if field in model_fields:
-                valid_fields.append(field)
-            else:
+            if field not in model_fields:
                 raise InvalidFieldError(
                     f"Поле {field} отсутствует в модели {str(cls.model)}"
                 )
-        return valid_fields
 
     @classmethod
     def _build_conditions(
@@ -587,32 +702,30 @@ class BaseRepository(Generic[T]):
             InvalidFieldError: Если найдено хоть одно невалидное поле
         """
 
-        filter_dict = filter.model_dump(exclude_unset=True)
-
-        if not filter_dict:
+        # Пустой model_fields_set означает пустой дамп с exclude_unset
+        if not filter.model_fields_set:
             raise EmptyFilterError("Поля фильтров не были переданы")
 
-        model_fields = cls._get_model_columns()
+        filter_dict = filter.model_dump(exclude_unset=True)
+
+        elements = cls._model_element_map
         conditions = []
         logger.debug("Передан словарь фильтров %s", filter_dict)
         for field, value in filter_dict.items():
-            if field in model_fields:
-                column = model_fields[field].element
-
-                if isinstance(value, list):
-                    # Фильтр IN для списков
-                    if len(value) == 0:
-                        continue  # Пропускаем пустые списки
-                    conditions.append(column.in_(value))
-                else:
-                    conditions.append(column == value)
-            else:
+            column = elements.get(field)
+            if column is None:
                 raise InvalidFieldError(
                     f"Поле '{field}' не найдено в модели {str(cls.model)}"
                 )
-        logger.error(
-            "Поулчившиеся условия %s из словаря %s", conditions, filter_dict
-        )
+
+            if isinstance(value, list):
+                # Фильтр IN для списков
+                if len(value) == 0:
+                    continue  # Пропускаем пустые списки
+                conditions.append(column.in_(value))
+            else:
+                conditions.append(column == value)
+        logger.debug("Построено %d условий фильтрации", len(conditions))
 
         return conditions
 
@@ -623,6 +736,8 @@ class BaseRepository(Generic[T]):
     ) -> int:
         """
         Создает одну или несколько записей в базе данных через insert DSL.
+        Записи вставляются пачками по INSERT_BATCH_SIZE строк через
+        executemany, что позволяет SQLAlchemy использовать insertmanyvalues.
 
         Args:
             values: BaseModel для одной записи или List[BaseModel] для нескольких записей
@@ -631,29 +746,160 @@ class BaseRepository(Generic[T]):
         Returns:
             int: Количество созданных записей
         """
-        start_time = time.time()
+        start_time = _start_timer()
 
-        if isinstance(values, BaseModel):
-            values_dicts = [values.model_dump(exclude_unset=True)]
-            logger.debug("Создание одной записи")
-        else:
-            values_dicts = [v.model_dump(exclude_unset=True) for v in values]
-            logger.debug("Создание %d записей батчем", len(values_dicts))
+        values_dicts = _dump_values(values)
+        logger.debug("Создание %d записей", len(values_dicts))
 
-        for value_dict in values_dicts:
-            fields_to_validate = list(value_dict.keys())
-            cls._validate_fields(fields_to_validate)
+        count = await cls._insert_dicts(values_dicts, session)
+        logger.debug(
+            "Создано %d записей за %.3f сек",
+            count,
+            _count_execute_time(start_time=start_time),
+        )
 
-        stmt = insert(cls.model).values(values_dicts)
+        return count
 
-        result = await session.execute(stmt)
+    @classmethod
+    async def _insert_dicts(
+        cls, values_dicts: List[Dict[str, Any]], session: AsyncSession
+    ) -> int:
+        """
+        Вставляет словари значений пачками через executemany.
+
+        Args:
+            values_dicts: Список словарей {поле: значение}
+            session: Асинхронная сессия SQLAlchemy
+
+        Returns:
+            int: Количество вставленных записей
+
+        Raises:
+            InvalidFieldError: При наличии невалидных полей
+        """
+        # Ключи всех строк объединяются в одно множество и проверяются разом
+        cls._validate_fields(set().union(*values_dicts))
+
+        # get_bind, а не session.bind: у сессии с binds= bind не задан
+        dialect = session.get_bind(mapper=cls.model).dialect
+        batch_size = INSERT_BATCH_SIZE.get(
+            dialect.name, DEFAULT_INSERT_BATCH_SIZE
+        )
+        for start in range(0, len(values_dicts), batch_size):
+            await session.execute(
+                cls._stmt_insert, values_dicts[start : start + batch_size]
+            )
+
+        # executemany не возвращает rowcount, а INSERT без ON CONFLICT
+        # либо вставляет все строки пачки, либо падает с ошибкой
+        return len(values_dicts)
+
+    @classmethod
+    @connection()
+    async def create_copy(
+        cls, values: Union[BaseModel, List[BaseModel]], session: AsyncSession
+    ) -> int:
+        """
+        Создает записи через бинарный протокол COPY (copy_records_to_table
+        в asyncpg), что на больших объемах на порядок быстрее INSERT.
+        Для других драйверов выполняет обычную пакетную вставку, как create.
+        COPY не применяет Python-side default колонок, поэтому если не
+        переданы значения для колонок с таким default, тоже используется
+        пакетная вставка. Ошибки драйвера оборачиваются в исключения
+        SQLAlchemy (IntegrityError, DBAPIError), как и для execute.
+        Все записи должны задавать одинаковый набор полей.
+
+        Args:
+            values: BaseModel для одной записи или List[BaseModel] для нескольких записей
+            session: Асинхронная сессия SQLAlchemy
+
+        Returns:
+            int: Количество созданных записей
+
+        Raises:
+            InvalidFieldError: При наличии невалидных полей
+            EmptyValueError: Если записи не задают ни одного поля
+            ValueError: Если записи задают разный набор полей
+            DBAPIError: При ошибке драйвера во время COPY
+        """
+        start_time = _start_timer()
+
+        if isinstance(values, BaseModel):
+            values = [values]
+        if not values:
+            return 0
+        if not values[0].model_fields_set:
+            raise EmptyValueError("Не переданы значения для создания")
+
+        driver = session.get_bind(mapper=cls.model).dialect.driver
+        if driver != "asyncpg":
+            logger.debug(
+                "COPY недоступен для драйвера %s, используется INSERT",
+                driver,
+            )
+            return await cls._insert_dicts(_dump_values(values), session)
+
+        cls._validate_fields(list(values[0].model_fields_set))
+        prepared = _copy_records(values, cls._column_order)
+        if prepared is not None:
+            columns, records = prepared
+        else:
+            values_dicts = _dump_values(values)
+            fields = values_dicts[0].keys()
+            columns = [field for field in cls._column_order if field in fields]
+
+            records = []
+            for value_dict in values_dicts:
+                if value_dict.keys() != fields:
+                    raise ValueError(
+                        "Для COPY все записи должны задавать одинаковый "
+                        "набор полей"
+                    )
+                records.append(tuple(value_dict[field] for field in columns))
+
+        table = cls.model.__table__
+        skipped_defaults = _python_default_columns(table, tuple(columns))
+        if skipped_defaults:
+            logger.debug(
+                "COPY не применит default колонок %s, используется INSERT",
+                skipped_defaults,
+            )
+            return await cls._insert_dicts(_dump_values(values), session)
+
+        conn = await session.connection(bind_arguments={"mapper": cls.model})
+        raw_connection = await conn.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        if not driver_connection.is_in_transaction():
+            # Адаптер SQLAlchemy открывает транзакцию лениво, на первом
+            # запросе; без нее COPY выполнился бы вне транзакции сессии.
+            # session.connection() BEGIN не отправляет, нужен сам запрос
+            await session.execute(PING_STMT)
+
+        statement = (
+            f"COPY {table.fullname} ({', '.join(columns)}) "
+            "FROM STDIN (FORMAT binary)"
+        )
+        sync_connection = conn.sync_connection
+        # Те же обработчики, что и для execute (логирование DB_ECHO)
+        sync_connection.dispatch.before_cursor_execute(
+            sync_connection, None, statement, records, None, True
+        )
+        try:
+            await driver_connection.copy_records_to_table(
+                table.name,
+                records=records,
+                columns=columns,
+                schema_name=table.schema,
+            )
+        except Exception as error:
+            await _raise_dbapi_error(conn, raw_connection, statement, error)
         logger.debug(
-            "Создано %d записей за %.3f сек",
-            result.rowcount,
+            "Создано %d записей через COPY за %.3f сек",
+            len(records),
             _count_execute_time(start_time=start_time),
         )
 
-        return result.rowcount
+        return len(records)
 
     @classmethod
     @connection()
@@ -676,12 +922,13 @@ class BaseRepository(Generic[T]):
             EmptyFilterError: Если не переданы параметры для удаления
         """
 
-        start_time = time.time()
+        start_time = _start_timer()
 
         if id is not None:
-            logger.debug(
-                "Вызов delete - ID: %s, фильтр: %s", id, repr(filters)
-            )
+            logger.debug("Вызов delete - ID: %s, фильтр: %r", id, filters)
+            # Значение в WHERE литеральное, а не bindparam: иначе
+            # synchronize_session="evaluate" не может вычислить условие
+            # и объекты переданной сессии не синхронизируются
             stmt = delete(cls.model).where(cls.model.id == id)
             result = await session.execute(stmt)
 
@@ -742,10 +989,8 @@ class BaseRepository(Generic[T]):
             NotFoundError: Если записи для обновления не найдены
             EmptyFilterError: Если не переданы критерии для обновления
         """
-        start_time = time.time()
-        logger.debug(
-            "Вызов update - ID: %s, есть_фильтр: %s", id, repr(filters)
-        )
+        start_time = _start_timer()
+        logger.debug("Вызов update - ID: %s, есть_фильтр: %r", id, filters)
         values_dict = values.model_dump(exclude_unset=True)
         if not values_dict:
             raise EmptyValueError("Не переданы значения для обновления")
@@ -753,6 +998,8 @@ class BaseRepository(Generic[T]):
         cls._validate_fields(list(values_dict.keys()))
 
         if id is not None:
+            # Литеральный WHERE, как и в delete: evaluate-синхронизация
+            # обновляет уже загруженные в сессию объекты
             stmt = (
                 update(cls.model)
                 .where(cls.model.id == id)
@@ -794,14 +1041,240 @@ class BaseRepository(Generic[T]):
             )
 
 
-def _count_execute_time(start_time: float):
+@lru_cache(maxsize=256)
+def _fields_getter(fields: Tuple[str, ...]) -> Callable[[Mapping], tuple]:
+    """
+    Возвращает закэшированную функцию выборки значений по кортежу полей.
+    Для нескольких полей это operator.itemgetter, который собирает
+    кортеж за один вызов; для одного поля результат тоже кортеж.
+
+    Args:
+        fields: Кортеж имен полей
+
+    Returns:
+        Callable[[Mapping], tuple]: Функция mapping -> кортеж значений
+    """
+    if len(fields) == 1:
+        field = fields[0]
+        return lambda mapping: (mapping[field],)
+    return itemgetter(*fields)
+
+
+@lru_cache(maxsize=256)
+def _list_adapter(schema: type) -> TypeAdapter:
+    """
+    Возвращает закэшированный TypeAdapter для списка схем одного типа.
+
+    Args:
+        schema: Класс Pydantic-схемы
+
+    Returns:
+        TypeAdapter: Адаптер для List[schema]
+    """
+    return TypeAdapter(List[schema])
+
+
+def _copy_records(
+    values: List[BaseModel], column_order: List[str]
+) -> Optional[Tuple[List[str], List[tuple]]]:
+    """
+    Собирает кортежи для COPY напрямую из атрибутов схем, без model_dump.
+    Применимо, если все схемы одного типа с одинаковым model_fields_set
+    и дамп этого типа совпадает с атрибутами (см. _dumps_as_attributes).
+    Иначе возвращает None, и вызывающий код собирает записи через дамп.
+
+    Args:
+        values: Список схем
+        column_order: Порядок колонок таблицы
+
+    Returns:
+        Optional[Tuple[List[str], List[tuple]]]: Колонки и записи или None
+    """
+    first = values[0]
+    schema = type(first)
+    fields_set = first.model_fields_set
+    for value in values:
+        if type(value) is not schema or value.model_fields_set != fields_set:
+            return None
+
+    if not _dumps_as_attributes(schema):
+        return None
+
+    columns = [field for field in column_order if field in fields_set]
+    if not columns:
+        return None
+    if len(columns) == 1:
+        column = columns[0]
+        records = [(getattr(value, column),) for value in values]
+    else:
+        getter = attrgetter(*columns)
+        records = [getter(value) for value in values]
+    return columns, records
+
+
+@lru_cache(maxsize=256)
+def _dumps_as_attributes(schema: type) -> bool:
+    """
+    Проверяет, совпадает ли model_dump схемы с ее атрибутами для любых
+    значений: у схемы нет сериализаторов, вычисляемых и исключаемых
+    полей, а все поля скалярных типов (вложенные модели дампятся в dict).
+
+    Args:
+        schema: Класс Pydantic-схемы
+
+    Returns:
+        bool: True, если записи можно собирать из атрибутов
+    """
+    decorators = schema.__pydantic_decorators__
+    if (
+        decorators.field_serializers
+        or decorators.model_serializers
+        or schema.model_computed_fields
+    ):
+        return False
+
+    for field in schema.model_fields.values():
+        if field.exclude or not _is_plain_type(field.annotation):
+            return False
+        if any(
+            isinstance(meta, (PlainSerializer, WrapSerializer))
+            for meta in field.metadata
+        ):
+            return False
+    return True
+
+
+def _is_plain_type(annotation: Any) -> bool:
+    """
+    Проверяет, что аннотация поля - скалярный тип или Optional от него.
+
+    Args:
+        annotation: Аннотация поля схемы
+
+    Returns:
+        bool: True для типов из _PLAIN_FIELD_TYPES и их объединений с None
+    """
+    if get_origin(annotation) in _UNION_TYPES:
+        return all(
+            arg is type(None) or _is_plain_type(arg)
+            for arg in get_args(annotation)
+        )
+    return annotation in _PLAIN_FIELD_TYPES
+
+
+@lru_cache(maxsize=256)
+def _python_default_columns(
+    table: Table, columns: Tuple[str, ...]
+) -> List[str]:
+    """
+    Возвращает колонки таблицы с Python-side default, не вошедшие в COPY.
+    Такие default применяет только INSERT через SQLAlchemy.
+
+    Args:
+        table: Таблица модели
+        columns: Колонки, значения которых переданы
+
+    Returns:
+        List[str]: Имена колонок, default которых COPY пропустил бы
+    """
+    return [
+        column.key
+        for column in table.columns
+        if column.default is not None and column.key not in columns
+    ]
+
+
+async def _raise_dbapi_error(
+    conn: AsyncConnection,
+    raw_connection: Any,
+    statement: str,
+    error: Exception,
+) -> NoReturn:
+    """
+    Переводит исключение asyncpg, полученное в обход execute, в исключение
+    SQLAlchemy: сначала в DBAPI-исключение адаптера, затем в DBAPIError
+    (IntegrityError, OperationalError и т.д.). При обрыве соединения
+    инвалидирует его, чтобы пул не выдал его повторно.
+
+    Args:
+        conn: Соединение сессии
+        raw_connection: Соединение пула с адаптером asyncpg
+        statement: Выполнявшийся запрос, попадает в текст ошибки
+        error: Исходное исключение драйвера
+
+    Raises:
+        DBAPIError: Обернутое исключение драйвера
+    """
+    dialect = conn.dialect
+    dbapi_connection = raw_connection.dbapi_connection
+    try:
+        # Адаптер SQLAlchemy для asyncpg сопоставляет исключения драйвера
+        # с DBAPI-исключениями; непереводимые пробрасываются как есть
+        dbapi_connection._handle_exception(error)
+    except dialect.loaded_dbapi.Error as dbapi_error:
+        is_disconnect = dialect.is_disconnect(
+            dbapi_error, dbapi_connection, None
+        )
+        if is_disconnect:
+            await conn.invalidate()
+        raise DBAPIError.instance(
+            statement,
+            None,
+            dbapi_error,
+            dialect.loaded_dbapi.Error,
+            dialect=dialect,
+            connection_invalidated=is_disconnect,
+        ) from error
+
+
+def _dump_values(
+    values: Union[BaseModel, List[BaseModel]],
+) -> List[Dict[str, Any]]:
+    """
+    Преобразует схему или список схем в список словарей (exclude_unset=True).
+    Список схем одного типа сериализуется одним вызовом pydantic-core
+    вместо model_dump на каждую строку.
+
+    Args:
+        values: BaseModel или список BaseModel
+
+    Returns:
+        List[Dict[str, Any]]: Список словарей со значениями
+    """
+    if isinstance(values, BaseModel):
+        return [values.model_dump(exclude_unset=True)]
+    if not values:
+        return []
+
+    schema = type(values[0])
+    if all(type(value) is schema for value in values):
+        return _list_adapter(schema).dump_python(values, exclude_unset=True)
+    return [value.model_dump(exclude_unset=True) for value in values]
+
+
+def _start_timer() -> Optional[float]:
+    """
+    Засекает время начала операции для отладочного лога.
+    Если DEBUG для логгера выключен, часы не читаются.
+
+    Returns:
+        Optional[float]: Значение time.perf_counter() или None
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        return time.perf_counter()
+    return None
+
+
+def _count_execute_time(start_time: Optional[float]) -> float:
     """
     Вычисляет время выполнения операции.
 
     Args:
-        start_time: Время начала выполнения в секундах (time.time())
+        start_time: Время начала из _start_timer()
 
     Returns:
-        float: Время выполнения в секундах
+        float: Время выполнения в секундах, 0.0 если время не засекалось
     """
-    return time.time() - start_time
+    if start_time is None:
+        return 0.0
+    return time.perf_counter() - start_time
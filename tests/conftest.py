@@ -1,9 +1,14 @@
 import pytest
 from pydantic import create_model
+from sqlalchemy.pool import QueuePool
 from test_repository import TestUserRepo
-from test_schemas.user import TestUserSchema
+from test_schemas.user import EMPTY_USER, TestUserSchema
 
-from dbalchemycore import Base, init_db
+from dbalchemycore import Base, get_settings, init_db
+
+
+# Класс схемы строится один раз на модуль: create_model дорогой
+InvalidFieldSchema = create_model("InvalidField", invalid_field=(str, ...))
 
 
 @pytest.hookimpl(tryfirst=True)
@@ -26,18 +31,51 @@ def pytest_exception_interact(node, call, report):
         ]
 
 
+def pytest_collection_modifyitems(config, items):
+    """
+    Пропускает тесты с маркером postgresql, если тестовая БД не PostgreSQL.
+    Позволяет гонять логику репозиториев на SQLite в памяти
+    (DB_DIALECT=sqlite, DB_DRIVER=aiosqlite, DB_NAME=:memory:).
+    """
+    if get_settings().DB_DIALECT == "postgresql":
+        return
+
+    skip = pytest.mark.skip(reason="требуется PostgreSQL")
+    for item in items:
+        if "postgresql" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture(scope="session", autouse=True)
 async def setup_database():
     """
     Настраивает тестовую базу данных перед выполнением тестов и очищает её после.
     Инициализирует базу данных перед тестами и удаляет все таблицы после завершения сессии.
+    Все тесты работают через один пул движка; по завершении сессии
+    проверяется, что ни одно соединение не осталось занятым.
     """
     await init_db(use_create_all=True)
     yield
-    from dbalchemycore.core.database import _engine
+    from dbalchemycore.core.database import get_engine
 
-    async with _engine.begin() as conn:
+    engine = get_engine()
+    if isinstance(engine.pool, QueuePool):
+        assert engine.pool.checkedout() == 0
+    async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    # Закрывает соединения пула: поток соединения aiosqlite в StaticPool
+    # не демонический и иначе не дает процессу завершиться
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session", autouse=True)
+async def warm_up(setup_database):
+    """
+    Прогревает движок и кэш скомпилированных выражений до первого теста.
+    Выполняет пустую выборку через репозиторий, чтобы разовая стоимость
+    первого подключения и компиляции не попадала в первый тест.
+    """
+    await TestUserRepo.get_many(filters=TestUserSchema(name="__warm_up__"))
 
 
 @pytest.fixture
@@ -54,11 +92,14 @@ async def create_test_user():
     await TestUserRepo.delete(filters=user_data)
 
 
-@pytest.fixture
+@pytest.fixture(scope="class")
 async def create_multiple_users():
     """
     Создает несколько тестовых пользователей для использования в тестах.
     Создает двух пользователей с одинаковыми именами, но разными email, и возвращает их список.
+    Пользователи вставляются одним вызовом create, то есть одним
+    executemany, переиспользуются всеми тестами класса и удаляются после
+    них.
     """
     users = [
         TestUserSchema(
@@ -69,23 +110,25 @@ async def create_multiple_users():
         ),
     ]
     await TestUserRepo.create(values=users)
-    return users
+    yield users
+    for user in users:
+        await TestUserRepo.delete(filters=user)
 
 
-@pytest.fixture
-async def empty_user():
+@pytest.fixture(scope="session")
+def empty_user():
     """
     Предоставляет пустую схему пользователя для тестирования сценариев с пустыми фильтрами.
-    Возвращает экземпляр TestUserSchema без заполненных полей.
+    Возвращает общий неизменяемый экземпляр TestUserSchema без заполненных
+    полей.
     """
-    return TestUserSchema()
+    return EMPTY_USER
 
 
-@pytest.fixture
-async def schema_invalid_field():
+@pytest.fixture(scope="session")
+def schema_invalid_field():
     """
     Предоставляет схему с недопустимым полем для тестирования обработки ошибок InvalidFieldError.
     Создает и возвращает Pydantic-модель с полем 'invalid_field'.
     """
-    InvalidFieldSchema = create_model("InvalidField", invalid_field=(str, ...))
     return InvalidFieldSchema(invalid_field="invalid")
@@ -0,0 +1,79 @@
+import pytest
+from pydantic import SecretStr, ValidationError
+from sqlalchemy.engine import make_url
+
+from dbalchemycore.core.config import DatabaseSettings
+
+
+def test_sqlalchemy_url_keeps_special_chars_in_password():
+    """
+    Тестируем что пароль со спецсимволами URL (@, :, /, %) попадает
+    в URL подключения без искажений и не ломает разбор хоста.
+    """
+    db_settings = DatabaseSettings(
+        DB_DIALECT="postgresql",
+        DB_DRIVER="asyncpg",
+        DB_USER="postgres",
+        DB_PASSWORD=SecretStr("p@ss:w/rd%"),
+        DB_HOST="db.local",
+        DB_NAME="app",
+    )
+
+    url = db_settings.sqlalchemy_url_obj
+    assert url.password == "p@ss:w/rd%"
+    assert url.host == "db.local"
+    assert url.database == "app"
+
+
+def test_sqlalchemy_url_for_sqlite_has_only_database():
+    """
+    Тестируем что для SQLite в URL попадает только путь к БД,
+    без учетных данных и хоста PostgreSQL по умолчанию.
+    """
+    db_settings = DatabaseSettings(
+        DB_DIALECT="sqlite",
+        DB_DRIVER="aiosqlite",
+        DB_USER="postgres",
+        DB_NAME=":memory:",
+    )
+
+    assert db_settings.sqlalchemy_url == "sqlite+aiosqlite:///:memory:"
+
+
+def test_sqlalchemy_url_is_built_once():
+    """
+    Тестируем что URL подключения собирается один раз на экземпляр
+    настроек и повторное обращение возвращает тот же объект.
+    """
+    db_settings = DatabaseSettings(DB_USER="postgres", DB_NAME="app")
+
+    assert db_settings.sqlalchemy_url is db_settings.sqlalchemy_url
+    assert db_settings.sqlalchemy_url_obj is db_settings.sqlalchemy_url_obj
+
+
+def test_sqlalchemy_url_is_string_with_escaped_password():
+    """
+    Тестируем что sqlalchemy_url остается строкой с открытым паролем,
+    а спецсимволы пароля экранированы и разбираются обратно без искажений.
+    """
+    db_settings = DatabaseSettings(
+        DB_DIALECT="postgresql",
+        DB_DRIVER="asyncpg",
+        DB_USER="postgres",
+        DB_PASSWORD=SecretStr("p@ss:w/rd%"),
+        DB_HOST="db.local",
+        DB_NAME="app",
+    )
+
+    url = db_settings.sqlalchemy_url
+    assert isinstance(url, str)
+    assert make_url(url).password == "p@ss:w/rd%"
+    assert make_url(url).host == "db.local"
+
+
+def test_pool_class_rejects_unknown_value():
+    """
+    Тестируем что DB_POOL_CLASS принимает только "queue" и "null".
+    """
+    with pytest.raises(ValidationError):
+        DatabaseSettings(DB_POOL_CLASS="static")
@@ -1,11 +1,22 @@
+import asyncio
+
 import pytest
-from sqlalchemy import text
+from sqlalchemy import event, inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
 
-from dbalchemycore import init_db
-from dbalchemycore.core.database import get_session
+from dbalchemycore import Base, connection, init_db, ping, settings
+from dbalchemycore.core import database
+from dbalchemycore.core.config import DatabaseSettings
+from dbalchemycore.core.database import (
+    PING_STMT,
+    get_db_dependency,
+    get_engine,
+    get_session,
+    get_sessionmaker,
+)
 
 
-@pytest.mark.asyncio
 async def test_init_db_creates_functional_connection():
     """
     Тестируем что после init_db можно установить соединение с БД
@@ -14,5 +25,245 @@ async def test_init_db_creates_functional_connection():
     await init_db(use_create_all=True)
 
     async with get_session() as session:
-        result = await session.execute(text("SELECT 1"))
+        result = await session.execute(PING_STMT)
         assert result.scalar() == 1
+
+
+async def test_ping_reports_available_database():
+    """
+    Тестируем что ping отвечает True для доступной БД.
+    """
+    assert await ping() is True
+
+
+@pytest.mark.postgresql
+async def test_init_db_warms_up_pool():
+    """
+    Тестируем что init_db заранее открывает DB_POOL_SIZE соединений
+    и оставляет их в пуле для немедленной выдачи.
+    """
+    await init_db(warm_up_pool=True)
+
+    assert get_engine().pool.checkedin() >= settings.DB_POOL_SIZE
+
+
+@pytest.mark.parametrize(
+    "pool_args, connects",
+    [({"pool_size": 2}, 2), ({"poolclass": NullPool}, 0)],
+    ids=["queue", "null"],
+)
+async def test_warm_up_pool_uses_engine_pool_size(
+    tmp_path, pool_args, connects
+):
+    """
+    Тестируем что прогрев открывает столько соединений, сколько задано
+    в пуле движка, и пропускает пулы, отличные от QueuePool.
+    """
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'warm_up.db'}", **pool_args
+    )
+    opened = []
+    event.listen(
+        engine.sync_engine, "connect", lambda *args: opened.append(args)
+    )
+    try:
+        await database._warm_up_pool(engine)
+        assert len(opened) == connects
+    finally:
+        await engine.dispose()
+
+
+async def test_concurrent_init_db_shares_one_engine():
+    """
+    Тестируем что конкурентные вызовы init_db не создают лишних движков
+    и не падают на повторном create_all.
+    """
+    engine = get_engine()
+
+    await asyncio.gather(*(init_db(use_create_all=True) for _ in range(3)))
+
+    assert get_engine() is engine
+
+
+def test_sessionmaker_is_created_once():
+    """
+    Тестируем что фабрика сессий создается один раз на процесс
+    и привязана к единственному движку.
+    """
+    session_maker = get_sessionmaker()
+
+    assert get_sessionmaker() is session_maker
+    assert session_maker.kw["bind"] is get_engine()
+
+
+async def test_repeated_create_all_skips_introspection():
+    """
+    Тестируем что повторный init_db(use_create_all=True) не отправляет
+    в БД запросов, если все таблицы метаданных уже созданы.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sync_engine = get_engine().sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        await init_db(use_create_all=True, warm_up_pool=False)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+
+    assert statements == []
+
+
+async def test_init_db_recreates_dropped_tables():
+    """
+    Тестируем что после drop_all и после dispose движка повторный
+    init_db(use_create_all=True) снова создает таблицы.
+    """
+    engine = get_engine()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await init_db(use_create_all=True, warm_up_pool=False)
+    assert await _table_names(engine) >= set(Base.metadata.tables)
+
+    await engine.dispose()
+    assert database._created_tables == set()
+    await init_db(use_create_all=True, warm_up_pool=False)
+    assert database._created_tables == set(Base.metadata.tables)
+
+
+async def _table_names(engine):
+    async with engine.connect() as conn:
+        return set(await conn.run_sync(lambda c: inspect(c).get_table_names()))
+
+
+async def test_session_does_not_expire_on_commit():
+    """
+    Тестируем что сессии из фабрики не сбрасывают загруженные атрибуты
+    после commit (expire_on_commit=False в фабрике сессий).
+    """
+    async with get_session() as session:
+        assert session.sync_session.expire_on_commit is False
+
+
+@connection(isolation_level="SERIALIZABLE", commit=False)
+async def _current_isolation_level(session):
+    result = await session.execute(text("SHOW transaction_isolation"))
+    return result.scalar()
+
+
+@pytest.mark.postgresql
+async def test_connection_applies_isolation_level():
+    """
+    Тестируем что декоратор connection открывает транзакцию
+    с переданным уровнем изоляции.
+    """
+    assert await _current_isolation_level() == "serializable"
+
+
+@connection(isolation_level="repeatable_read", commit=False)
+async def _current_normalized_isolation_level(session):
+    result = await session.execute(text("SHOW transaction_isolation"))
+    return result.scalar()
+
+
+@pytest.mark.postgresql
+async def test_connection_normalizes_isolation_level():
+    """
+    Тестируем что декоратор connection принимает уровень изоляции
+    в нижнем регистре и через "_" и применяет его к транзакции.
+    """
+    assert await _current_normalized_isolation_level() == "repeatable read"
+
+
+def test_connection_rejects_unknown_isolation_level():
+    """
+    Тестируем что декоратор connection не принимает уровень изоляции
+    вне списка допустимых еще на этапе декорирования.
+    """
+    with pytest.raises(ValueError):
+        connection(isolation_level="SERIALIZABLE; DROP TABLE testusers")
+
+
+@pytest.mark.postgresql
+async def test_engine_applies_server_settings():
+    """
+    Тестируем что соединения пула открываются с server_settings
+    из настроек (application_name и jit).
+    """
+    async with get_session() as session:
+        application_name = await session.execute(text("SHOW application_name"))
+        jit = await session.execute(text("SHOW jit"))
+
+        assert application_name.scalar() == settings.DB_APPLICATION_NAME
+        assert jit.scalar() == ("on" if settings.DB_JIT else "off")
+
+
+def test_engine_bounds_compiled_cache():
+    """
+    Тестируем что кэш скомпилированных выражений движка ограничен
+    размером DB_QUERY_CACHE_SIZE.
+    """
+    compiled_cache = get_engine().sync_engine._compiled_cache
+
+    assert compiled_cache.capacity == settings.DB_QUERY_CACHE_SIZE
+
+
+async def test_db_dependency_yields_working_session():
+    """
+    Тестируем что зависимость для FastAPI отдает рабочую сессию
+    и закрывает ее после завершения генератора.
+    """
+    dependency = get_db_dependency()
+    session = await dependency.__anext__()
+
+    result = await session.execute(PING_STMT)
+    assert result.scalar() == 1
+
+    await dependency.aclose()
+    assert not session.in_transaction()
+
+
+@pytest.mark.postgresql
+async def test_engine_uses_null_pool_when_configured(monkeypatch):
+    """
+    Тестируем что при DB_POOL_CLASS=null движок создается без пула
+    и соединения все равно работают.
+    """
+    null_settings = settings.model_copy(update={"DB_POOL_CLASS": "null"})
+    monkeypatch.setattr(database, "get_settings", lambda: null_settings)
+
+    engine = database.get_engine.__wrapped__()
+    try:
+        assert isinstance(engine.pool, NullPool)
+        async with engine.connect() as conn:
+            result = await conn.execute(PING_STMT)
+            assert result.scalar() == 1
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "db_name, pool_class",
+    [(":memory:", StaticPool), ("app.db", QueuePool)],
+    ids=["memory", "file"],
+)
+async def test_sqlite_static_pool_only_for_memory(
+    monkeypatch, db_name, pool_class
+):
+    """
+    Тестируем что StaticPool используется только для SQLite в памяти,
+    а файловая SQLite БД остается на пуле по умолчанию.
+    """
+    sqlite_settings = DatabaseSettings(
+        DB_DIALECT="sqlite", DB_DRIVER="aiosqlite", DB_NAME=db_name
+    )
+    monkeypatch.setattr(database, "get_settings", lambda: sqlite_settings)
+
+    engine = database.get_engine.__wrapped__()
+    try:
+        assert isinstance(engine.pool, pool_class)
+    finally:
+        await engine.dispose()
@@ -1,9 +1,30 @@
+from typing import Optional
+
 import pytest
-from pydantic import create_model
-from sqlalchemy.exc import IntegrityError, MultipleResultsFound
+from pydantic import BaseModel, create_model, field_serializer
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    event,
+    func,
+    inspect,
+)
+from sqlalchemy.exc import (
+    DBAPIError,
+    IntegrityError,
+    MultipleResultsFound,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr
 from test_repositories.user_repo import TestUserRepo
-from test_schemas.user import TestUserSchema
+from test_schemas.user import EMPTY_USER, TestUserSchema
 
+from dbalchemycore import Base
+from dbalchemycore.core.database import connection, get_engine, get_session
 from dbalchemycore.core.exc import (
     EmptyFilterError,
     EmptyValueError,
@@ -11,11 +32,18 @@ from dbalchemycore.core.exc import (
     NotFoundError,
     UnknowAggregationFunc,
 )
+from dbalchemycore.models import created_at, id_field, updated_at
+from dbalchemycore.repositories.abstract_repo import (
+    _copy_records,
+    _dump_values,
+    _python_default_columns,
+)
+
+
+HavingFilterSchema = create_model("Filter", id_count=(int, 5))
 
 
-@pytest.mark.asyncio
 class TestUserRepoCRUD:
-    @pytest.mark.asyncio
     async def test_create_user(self):
         """
         Тестирует создание нового пользователя в репозитории.
@@ -27,7 +55,6 @@ class TestUserRepoCRUD:
         count = await TestUserRepo.create(values=user)
         assert count == 1
 
-    @pytest.mark.asyncio
     async def test_get_one_user(self):
         """
         Тестирует получение одного пользователя по ID.
@@ -36,7 +63,6 @@ class TestUserRepoCRUD:
         user = await TestUserRepo.get_one(id=1)
         assert user["name"] == "Alice"
 
-    @pytest.mark.asyncio
     async def test_update_user(self):
         """
         Тестирует обновление данных пользователя.
@@ -48,7 +74,6 @@ class TestUserRepoCRUD:
         count = await TestUserRepo.update(values=update_data, id=1)
         assert count == 1
 
-    @pytest.mark.asyncio
     async def test_delete_user(self):
         """
         Тестирует удаление пользователя по ID.
@@ -57,7 +82,6 @@ class TestUserRepoCRUD:
         count = await TestUserRepo.delete(id=1)
         assert count == 1
 
-    @pytest.mark.asyncio
     async def test_get_one_not_found(self):
         """
         Тестирует получение пользователя по несуществующему ID.
@@ -67,88 +91,121 @@ class TestUserRepoCRUD:
         assert res is None
 
 
-@pytest.mark.asyncio
-class TestExcEmptyFilterRepoCRUD:
-    async def test_get_one_with_empty_schema(self, empty_user):
+class TestGetByIdRepoCRUD:
+    async def test_get_one_by_id_matches_filtered_get_one(
+        self, create_test_user
+    ):
         """
-        Тестирует вызов get_one с пустым фильтром.
-        Проверяет, что выбрасывается исключение EmptyFilterError.
+        Тестирует путь get_one по ID через заранее построенный SELECT.
+        Проверяет, что результат совпадает с выборкой по фильтру.
         """
-        with pytest.raises(EmptyFilterError):
-            await TestUserRepo.get_one(filters=empty_user)
+        expected = await TestUserRepo.get_one(
+            filters=TestUserSchema(email="alice@example.com")
+        )
 
-    async def test_get_many_with_empty_schema(self, empty_user):
+        assert await TestUserRepo.get_one(id=expected["id"]) == expected
+
+    async def test_get_one_by_missing_id_returns_none(self):
         """
-        Тестирует вызов get_many с пустым фильтром.
-        Проверяет, что выбрасывается исключение EmptyFilterError.
+        Тестирует получение записи по несуществующему ID.
+        Проверяет, что возвращается None.
         """
-        with pytest.raises(EmptyFilterError):
-            await TestUserRepo.get_many(filters=empty_user)
+        assert await TestUserRepo.get_one(id=10**9) is None
 
-    async def test_delete_with_empty_schema(self, empty_user):
+    @pytest.mark.postgresql
+    async def test_get_one_by_id_wraps_driver_errors(self):
         """
-        Тестирует вызов delete с пустым фильтром.
-        Проверяет, что выбрасывается исключение EmptyFilterError.
+        Тестирует ошибку драйвера в запросе get_one по ID.
+        Проверяет, что она приходит обернутой в DBAPIError SQLAlchemy.
         """
-        with pytest.raises(EmptyFilterError):
-            await TestUserRepo.delete(filters=empty_user)
+        with pytest.raises(DBAPIError):
+            await TestUserRepo.get_one(id="not-a-number")
 
-    async def test_update_with_empty_filter(self, empty_user):
-        """
-        Тестирует вызов update с пустым фильтром.
+
+class TestExcEmptyFilterRepoCRUD:
+    @pytest.mark.parametrize(
+        "method, kwargs",
+        [
+            ("get_one", {}),
+            ("get_many", {}),
+            ("delete", {}),
+            ("update", {"values": TestUserSchema(name="Updated")}),
+        ],
+        ids=["get_one", "get_many", "delete", "update"],
+    )
+    async def test_empty_filter(self, empty_user, method, kwargs):
+        """
+        Тестирует вызов методов репозитория с пустым фильтром.
         Проверяет, что выбрасывается исключение EmptyFilterError.
         """
-        update_data = TestUserSchema(name="Updated")
         with pytest.raises(EmptyFilterError):
-            await TestUserRepo.update(filters=empty_user, values=update_data)
-
+            await getattr(TestUserRepo, method)(filters=empty_user, **kwargs)
 
-@pytest.mark.asyncio
-class TestExcInvalidFieldRepoCRUD:
-    async def test_get_one_with_invalid_field(self, schema_invalid_field):
+    async def test_empty_arguments_do_not_checkout_connection(
+        self, empty_user
+    ):
         """
-        Тестирует вызов get_one с недопустимым полем в фильтре.
-        Проверяет, что выбрасывается исключение InvalidFieldError.
+        Тестирует что ошибки пустых фильтров и значений выбрасываются
+        до обращения к БД.
+        Проверяет, что соединение из пула при этом не запрашивается.
         """
-        with pytest.raises(InvalidFieldError):
-            await TestUserRepo.get_one(filters=schema_invalid_field)
+        checkouts = []
+        pool = get_engine().sync_engine.pool
 
-    async def test_get_many_with_invalid_field(self, schema_invalid_field):
-        """
-        Тестирует вызов get_many с недопустимым полем в фильтре.
-        Проверяет, что выбрасывается исключение InvalidFieldError.
-        """
-        with pytest.raises(InvalidFieldError):
-            await TestUserRepo.get_many(filters=schema_invalid_field)
+        def record(*args):
+            checkouts.append(args)
+
+        event.listen(pool, "checkout", record)
+        try:
+            with pytest.raises(EmptyFilterError):
+                await TestUserRepo.get_many(filters=empty_user)
+            with pytest.raises(EmptyFilterError):
+                await TestUserRepo.delete(filters=empty_user)
+            with pytest.raises(EmptyValueError):
+                await TestUserRepo.update(values=empty_user, id=1)
+        finally:
+            event.remove(pool, "checkout", record)
+
+        assert checkouts == []
 
-    async def test_create_with_invalid_field(self, schema_invalid_field):
-        """
-        Тестирует вызов create с недопустимым полем в данных.
-        Проверяет, что выбрасывается исключение InvalidFieldError.
-        """
-        with pytest.raises(InvalidFieldError):
-            await TestUserRepo.create(values=schema_invalid_field)
 
-    async def test_update_with_invalid_field(
-        self, create_test_user, schema_invalid_field
+class TestExcInvalidFieldRepoCRUD:
+    @pytest.mark.parametrize(
+        "method, argument, kwargs",
+        [
+            ("get_one", "filters", {}),
+            ("get_many", "filters", {}),
+            ("create", "values", {}),
+            ("update", "values", {"id": 1}),
+            ("delete", "filters", {}),
+        ],
+        ids=["get_one", "get_many", "create", "update", "delete"],
+    )
+    async def test_invalid_field(
+        self, schema_invalid_field, method, argument, kwargs
     ):
         """
-        Тестирует вызов update с недопустимым полем в данных.
+        Тестирует вызов методов репозитория с недопустимым полем в фильтре
+        или в данных.
         Проверяет, что выбрасывается исключение InvalidFieldError.
         """
+        kwargs = {argument: schema_invalid_field, **kwargs}
         with pytest.raises(InvalidFieldError):
-            await TestUserRepo.update(values=schema_invalid_field, id=1)
+            await getattr(TestUserRepo, method)(**kwargs)
 
-    async def test_delete_with_invalid_field(self, schema_invalid_field):
+    def test_validate_fields_accepts_generator(self):
         """
-        Тестирует вызов delete с недопустимым полем в фильтре.
-        Проверяет, что выбрасывается исключение InvalidFieldError.
+        Тестирует валидацию полей, переданных генератором.
+        Проверяет, что возвращаются все поля, а невалидное поле
+        в генераторе по-прежнему приводит к InvalidFieldError.
         """
+        fields = TestUserRepo._validate_fields(f for f in ("name", "email"))
+        assert fields == ["name", "email"]
+
         with pytest.raises(InvalidFieldError):
-            await TestUserRepo.delete(filters=schema_invalid_field)
+            TestUserRepo._validate_fields(f for f in ("name", "invalid"))
 
 
-@pytest.mark.asyncio
 class TestExcUnknowAggregationFuncRepoCRUD:
     async def test_get_many_with_unknown_aggregation(self):
         """
@@ -161,7 +218,6 @@ class TestExcUnknowAggregationFuncRepoCRUD:
             )
 
 
-@pytest.mark.asyncio
 class TestExcMultipleResultRepoCRUD:
     async def test_get_one_multiple_results(self, create_multiple_users):
         """
@@ -173,24 +229,22 @@ class TestExcMultipleResultRepoCRUD:
             await TestUserRepo.get_one(filters=filters, strict=True)
 
 
-@pytest.mark.asyncio
 class TestExcNotFoundErrorRepoCRUD:
-    async def test_delete_not_found(self):
-        """
-        Тестирует вызов delete с несуществующим ID.
-        Проверяет, что выбрасывается исключение NotFoundError.
-        """
-        with pytest.raises(NotFoundError):
-            await TestUserRepo.delete(id=999)
-
-    async def test_update_not_found(self):
-        """
-        Тестирует вызов update с несуществующим ID.
+    @pytest.mark.parametrize(
+        "method, kwargs",
+        [
+            ("delete", {}),
+            ("update", {"values": TestUserSchema(name="Updated")}),
+        ],
+        ids=["delete", "update"],
+    )
+    async def test_not_found(self, method, kwargs):
+        """
+        Тестирует вызов delete и update с несуществующим ID.
         Проверяет, что выбрасывается исключение NotFoundError.
         """
-        update_data = TestUserSchema(name="Updated")
         with pytest.raises(NotFoundError):
-            await TestUserRepo.update(values=update_data, id=999)
+            await getattr(TestUserRepo, method)(id=999, **kwargs)
 
     async def test_get_many_not_found(self):
         """
@@ -202,19 +256,16 @@ class TestExcNotFoundErrorRepoCRUD:
         assert result == []
 
 
-@pytest.mark.asyncio
 class TestExcEmptyValueErrorRepoCRUD:
     async def test_update_with_empty_values(self, create_test_user):
         """
         Тестирует вызов update с пустыми значениями.
         Проверяет, что выбрасывается исключение EmptyValueError.
         """
-        update_data = TestUserSchema()
         with pytest.raises(EmptyValueError):
-            await TestUserRepo.update(values=update_data, id=1)
+            await TestUserRepo.update(values=EMPTY_USER, id=1)
 
 
-@pytest.mark.asyncio
 class TestExcIntegrityErrorRepoCRUD:
     async def test_create_duplicate_email(self, create_test_user):
         """
@@ -228,13 +279,522 @@ class TestExcIntegrityErrorRepoCRUD:
             await TestUserRepo.create(values=user)
 
 
-@pytest.mark.asyncio
 class TestExcHavingWithoutGroupBy:
     async def test_get_many_having_without_group_by(self):
         """
         Тестирует вызов get_many с having-фильтром без указания group_by.
         Проверяет, что выбрасывается исключение ValueError.
         """
-        having_filter = create_model("Filter", id_count=(int, 5))
         with pytest.raises(ValueError):
-            await TestUserRepo.get_many(having_filters=having_filter)
+            await TestUserRepo.get_many(having_filters=HavingFilterSchema)
+
+
+class TestSelectFieldsRepoCRUD:
+    async def test_get_many_select_fields(self, create_test_user):
+        """
+        Тестирует вызов get_many с выборкой части полей.
+        Проверяет, что в результат попадают только запрошенные поля.
+        """
+        filters = TestUserSchema(email="alice@example.com")
+        result = await TestUserRepo.get_many(
+            filters=filters, select_fields=["name", "email"]
+        )
+        assert result == [{"name": "Alice", "email": "alice@example.com"}]
+
+    async def test_get_many_distinct_single_field(self, create_test_user):
+        """
+        Тестирует вызов get_many с DISTINCT по одному полю.
+        Проверяет, что ключ результата совпадает с именем поля.
+        """
+        filters = TestUserSchema(email="alice@example.com")
+        result = await TestUserRepo.get_many(
+            filters=filters, select_fields=["name"], is_distinct=True
+        )
+        assert result == [{"name": "Alice"}]
+
+    async def test_get_many_distinct_multiple_fields(self):
+        """
+        Тестирует вызов get_many с DISTINCT по нескольким полям.
+        Проверяет, что уникальность считается по всей паре полей.
+        """
+        users = [
+            TestUserSchema(
+                name="Dist", surname="A", email="dist1@example.com"
+            ),
+            TestUserSchema(
+                name="Dist", surname="A", email="dist2@example.com"
+            ),
+            TestUserSchema(
+                name="Dist", surname="B", email="dist3@example.com"
+            ),
+        ]
+        await TestUserRepo.create(values=users)
+
+        result = await TestUserRepo.get_many(
+            filters=TestUserSchema(name="Dist"),
+            select_fields=["name", "surname"],
+            is_distinct=True,
+            order_by="surname",
+        )
+        assert result == [
+            {"name": "Dist", "surname": "A"},
+            {"name": "Dist", "surname": "B"},
+        ]
+
+        await TestUserRepo.delete(filters=TestUserSchema(name="Dist"))
+
+
+class TestDumpValues:
+    def test_dump_values_keeps_exclude_unset_per_row(self):
+        """
+        Тестирует пакетную сериализацию списка схем.
+        Проверяет, что для каждой строки остаются только заданные поля.
+        """
+        values = [
+            TestUserSchema(name="Alice"),
+            TestUserSchema(name="Bob", email="bob@example.com"),
+        ]
+        assert _dump_values(values) == [
+            {"name": "Alice"},
+            {"name": "Bob", "email": "bob@example.com"},
+        ]
+
+    def test_copy_records_reads_attributes_in_column_order(self):
+        """
+        Тестирует сборку записей для COPY из атрибутов схем.
+        Проверяет порядок колонок и отказ от быстрого пути при разном
+        наборе заданных полей.
+        """
+        values = [
+            TestUserSchema(email="a@example.com", name="A"),
+            TestUserSchema(email="b@example.com", name="B"),
+        ]
+        column_order = TestUserRepo._column_order
+
+        assert _copy_records(values, column_order) == (
+            ["name", "email"],
+            [("A", "a@example.com"), ("B", "b@example.com")],
+        )
+        values.append(TestUserSchema(name="C"))
+        assert _copy_records(values, column_order) is None
+
+    def test_copy_records_falls_back_for_custom_serialization(self):
+        """
+        Тестирует отказ от сборки записей из атрибутов для схем, дамп
+        которых может отличаться от атрибутов.
+        Проверяет схемы с field_serializer, зависящим от значения, и
+        с вложенной моделью: первая строка при этом совпадает с дампом.
+        """
+
+        class SerializedSchema(BaseModel):
+            name: str
+
+            @field_serializer("name")
+            def upper_long_names(self, name: str) -> str:
+                return name.upper() if len(name) > 3 else name
+
+        class NestedSchema(BaseModel):
+            name: Optional[TestUserSchema] = None
+
+        column_order = TestUserRepo._column_order
+
+        serialized = [
+            SerializedSchema(name="Al"),
+            SerializedSchema(name="Bob!"),
+        ]
+        assert _copy_records(serialized, column_order) is None
+
+        nested = [NestedSchema(name=TestUserSchema(name="A"))]
+        assert _copy_records(nested, column_order) is None
+
+
+class TestModelTableName:
+    def test_table_name_is_generated_from_class_name(self):
+        """
+        Тестирует автоматическое имя таблицы модели.
+        Проверяет, что оно равно имени класса в нижнем регистре + 's'.
+        """
+        assert TestUserRepo.model.__tablename__ == "testusers"
+        assert TestUserRepo.model.__table__.name == "testusers"
+
+    @staticmethod
+    def _isolated_base():
+        """Абстрактная база со своей MetaData, чтобы не трогать схему тестов."""
+
+        class _IsolatedBase(Base):
+            __abstract__ = True
+            metadata = MetaData()
+
+        return _IsolatedBase
+
+    def test_subclass_of_mapped_model_uses_single_table(self):
+        """
+        Тестирует single-table inheritance для подклассов без своей таблицы.
+        Проверяет, что подкласс без __tablename__ и подкласс с явным
+        __tablename__ = None используют таблицу родителя.
+        """
+
+        class Animal(self._isolated_base()):
+            id: Mapped[id_field]
+            kind: Mapped[str]
+            __mapper_args__ = {
+                "polymorphic_on": "kind",
+                "polymorphic_identity": "animal",
+            }
+
+        class Dog(Animal):
+            __mapper_args__ = {"polymorphic_identity": "dog"}
+
+        class Cat(Animal):
+            __tablename__ = None
+            __mapper_args__ = {"polymorphic_identity": "cat"}
+
+        assert Animal.__table__.name == "animals"
+        assert Dog.__table__ is Animal.__table__
+        assert Cat.__table__ is Animal.__table__
+
+    def test_table_name_from_mixin_is_kept(self):
+        """
+        Тестирует имя таблицы, заданное миксином через declared_attr.
+        Проверяет, что автоматическое имя его не переопределяет.
+        """
+
+        class PrefixedTableMixin:
+            @declared_attr.directive
+            def __tablename__(cls) -> str:
+                return "app_" + cls.__name__.lower()
+
+        class Thing(PrefixedTableMixin, self._isolated_base()):
+            id: Mapped[id_field]
+
+        assert Thing.__table__.name == "app_thing"
+
+
+class TestModelAnnotations:
+    def test_timestamp_annotations_map_to_datetime_columns(self):
+        """
+        Тестирует аннотации created_at и updated_at на модели.
+        Проверяет тип колонок и общее серверное выражение now().
+        """
+
+        class _Base(DeclarativeBase):
+            pass
+
+        class Stamped(_Base):
+            __tablename__ = "stamped"
+            id: Mapped[id_field]
+            created: Mapped[created_at]
+            updated: Mapped[updated_at]
+
+        columns = Stamped.__table__.c
+        assert isinstance(columns.created.type, DateTime)
+        assert isinstance(columns.updated.type, DateTime)
+        assert (
+            columns.created.server_default.arg is columns.updated.onupdate.arg
+        )
+
+
+class TestBatchCreateRepoCRUD:
+    async def test_create_more_rows_than_batch_size(self):
+        """
+        Тестирует создание записей в количестве больше размера пачки.
+        Проверяет, что вставлены все строки из всех пачек.
+        """
+        users = [
+            TestUserSchema(
+                name="Batch", surname="User", email=f"batch{i}@example.com"
+            )
+            for i in range(2500)
+        ]
+        count = await TestUserRepo.create(values=users)
+        assert count == 2500
+
+        deleted = await TestUserRepo.delete(
+            filters=TestUserSchema(name="Batch")
+        )
+        assert deleted == 2500
+
+    async def test_create_copy(self):
+        """
+        Тестирует создание записей через COPY.
+        Проверяет, что записи видны после коммита и удаляются по фильтру.
+        """
+        users = [
+            TestUserSchema(
+                name="Copy", surname="User", email=f"copy{i}@example.com"
+            )
+            for i in range(10)
+        ]
+        count = await TestUserRepo.create_copy(values=users)
+        assert count == 10
+
+        rows = await TestUserRepo.get_many(filters=TestUserSchema(name="Copy"))
+        assert len(rows) == 10
+
+        deleted = await TestUserRepo.delete(
+            filters=TestUserSchema(name="Copy")
+        )
+        assert deleted == 10
+
+    async def test_create_copy_duplicate_raises_integrity_error(
+        self, create_test_user
+    ):
+        """
+        Тестирует вставку через COPY записи с уже существующим email.
+        Проверяет, что ошибка драйвера обернута в IntegrityError SQLAlchemy.
+        """
+        user = TestUserSchema(
+            name="Copy", surname="Dup", email="alice@example.com"
+        )
+        with pytest.raises(IntegrityError):
+            await TestUserRepo.create_copy(values=[user])
+
+    async def test_create_copy_with_empty_values(self):
+        """
+        Тестирует вызов create_copy со схемами без заданных полей.
+        Проверяет, что выбрасывается исключение EmptyValueError.
+        """
+        with pytest.raises(EmptyValueError):
+            await TestUserRepo.create_copy(values=[EMPTY_USER, EMPTY_USER])
+
+    def test_python_default_columns_are_reported(self):
+        """
+        Тестирует поиск колонок с Python-side default, которые COPY
+        пропустил бы.
+        Проверяет, что переданная колонка и server_default не считаются.
+        """
+        table = Table(
+            "copy_defaults",
+            MetaData(),
+            Column("id", Integer, primary_key=True),
+            Column("status", String, default="new"),
+            Column("note", String, default="-"),
+            Column("created_at", DateTime, server_default=func.now()),
+        )
+
+        assert _python_default_columns(table, ("id", "note")) == ["status"]
+
+
+class TestAggregationRepoCRUD:
+    async def test_get_many_group_by_with_count(self):
+        """
+        Тестирует вызов get_many с группировкой и агрегацией count.
+        Проверяет имя агрегатной колонки и посчитанное значение.
+        """
+        users = [
+            TestUserSchema(
+                name="Agg", surname="User", email=f"agg{i}@example.com"
+            )
+            for i in range(3)
+        ]
+        await TestUserRepo.create(values=users)
+
+        result = await TestUserRepo.get_many(
+            filters=TestUserSchema(name="Agg"),
+            group_by="name",
+            aggregations={"email": "COUNT"},
+        )
+        assert result == [{"name": "Agg", "email_count": 3}]
+
+        await TestUserRepo.delete(filters=TestUserSchema(name="Agg"))
+
+
+@pytest.mark.postgresql
+class TestExecuteSqlRepoCRUD:
+    async def test_execute_sql(self):
+        """
+        Тестирует выполнение произвольного SQL-запроса.
+        Проверяет, что строки возвращаются списком словарей.
+        """
+        rows = await TestUserRepo.execute_sql(
+            "SELECT generate_series(1, 3) AS x"
+        )
+        assert rows == [{"x": 1}, {"x": 2}, {"x": 3}]
+
+    async def test_execute_sql_iter_chunks(self):
+        """
+        Тестирует потоковое чтение результата пачками меньше выборки.
+        Проверяет, что отданы все строки в исходном порядке.
+        """
+        rows = [
+            row["x"]
+            async for row in TestUserRepo.execute_sql_iter(
+                "SELECT generate_series(1, 5) AS x", chunk_size=2
+            )
+        ]
+        assert rows == [1, 2, 3, 4, 5]
+
+
+class TestPaginationRepoCRUD:
+    async def test_get_many_limit_and_offset(self):
+        """
+        Тестирует вызов get_many с limit и offset, включая нулевые значения.
+        Проверяет, что offset=0 не смещает выборку, а limit=0 дает пустой
+        результат.
+        """
+        users = [
+            TestUserSchema(
+                name="Page", surname=f"User{i}", email=f"page{i}@example.com"
+            )
+            for i in range(3)
+        ]
+        await TestUserRepo.create(values=users)
+        filters = TestUserSchema(name="Page")
+
+        page = await TestUserRepo.get_many(
+            filters=filters, order_by="surname", limit=2, offset=1
+        )
+        assert [row["surname"] for row in page] == ["User1", "User2"]
+
+        first = await TestUserRepo.get_many(
+            filters=filters, order_by="surname", limit=1, offset=0
+        )
+        assert [row["surname"] for row in first] == ["User0"]
+
+        assert await TestUserRepo.get_many(filters=filters, limit=0) == []
+
+        await TestUserRepo.delete(filters=filters)
+
+
+class TestCompiledCacheRepoCRUD:
+    async def test_same_query_shape_reuses_compiled_statement(self):
+        """
+        Тестирует что запросы одной формы с разными значениями фильтров
+        компилируются один раз.
+        Проверяет, что размер кэша скомпилированных выражений не растет.
+        """
+        compiled_cache = get_engine().sync_engine._compiled_cache
+        await TestUserRepo.get_many(filters=TestUserSchema(name="Cache0"))
+        size = len(compiled_cache)
+
+        for i in range(1, 5):
+            await TestUserRepo.get_many(
+                filters=TestUserSchema(name=f"Cache{i}")
+            )
+
+        assert len(compiled_cache) == size
+
+
+class TestOuterSessionRepoCRUD:
+    async def test_methods_reuse_passed_session(self):
+        """
+        Тестирует вызов методов репозитория с переданной сессией.
+        Проверяет, что они работают в ее транзакции и не коммитят:
+        после отката изменения не видны.
+        """
+        user = TestUserSchema(
+            name="Outer", surname="Tx", email="outer@example.com"
+        )
+        filters = TestUserSchema(email="outer@example.com")
+
+        async with get_session() as session:
+            await TestUserRepo.create(values=user, session=session)
+            found = await TestUserRepo.get_one(
+                filters=filters, session=session
+            )
+            assert found["name"] == "Outer"
+            await session.rollback()
+
+        assert await TestUserRepo.get_one(filters=filters) is None
+
+    async def test_session_with_begin_commits_on_exit(self):
+        """
+        Тестирует сессию get_session(begin=True) с переданными методами.
+        Проверяет, что изменения закоммичены после выхода из блока.
+        """
+        user = TestUserSchema(
+            name="Begin", surname="Tx", email="begin@example.com"
+        )
+        filters = TestUserSchema(email="begin@example.com")
+
+        async with get_session(begin=True) as session:
+            await TestUserRepo.create(values=user, session=session)
+
+        found = await TestUserRepo.get_one(filters=filters)
+        assert found["name"] == "Begin"
+
+        await TestUserRepo.delete(filters=filters)
+
+
+class TestSessionSyncRepoCRUD:
+    async def test_update_and_delete_by_id_sync_loaded_objects(self):
+        """
+        Тестирует update и delete по ID в переданной сессии с уже
+        загруженным объектом.
+        Проверяет, что объект получает новое значение после update
+        и помечается удаленным после delete.
+        """
+        user = TestUserSchema(
+            name="A", surname="Sync", email="sync@example.com"
+        )
+
+        async with get_session() as session:
+            await TestUserRepo.create(values=user, session=session)
+            row = await TestUserRepo.get_one(
+                filters=TestUserSchema(email="sync@example.com"),
+                session=session,
+            )
+            obj = await session.get(TestUserRepo.model, row["id"])
+
+            await TestUserRepo.update(
+                values=TestUserSchema(name="B"), id=obj.id, session=session
+            )
+            assert obj.name == "B"
+
+            await TestUserRepo.delete(id=obj.id, session=session)
+            assert inspect(obj).was_deleted
+            await session.rollback()
+
+
+class TestBindsSessionRepoCRUD:
+    async def test_create_with_session_bound_through_binds(self):
+        """
+        Тестирует create и create_copy с сессией, настроенной через binds=.
+        Проверяет, что диалект берется из get_bind: session.bind у такой
+        сессии не задан.
+        """
+        users = [
+            TestUserSchema(
+                name="Binds", surname=f"User{i}", email=f"binds{i}@example.com"
+            )
+            for i in range(2)
+        ]
+
+        async with AsyncSession(
+            binds={TestUserRepo.model: get_engine()}
+        ) as session:
+            assert getattr(session, "bind", None) is None
+            assert await TestUserRepo.create(values=users[0], session=session)
+            assert await TestUserRepo.create_copy(
+                values=[users[1]], session=session
+            )
+            await session.rollback()
+
+
+class TestConnectionCommitRepoCRUD:
+    async def test_method_may_commit_and_continue(self):
+        """
+        Тестирует метод под connection(), который сам коммитит сессию
+        и продолжает работу.
+        Проверяет, что обе записи сохранены: вторая транзакция
+        коммитится декоратором при выходе.
+        """
+        users = [
+            TestUserSchema(
+                name="Mid", surname=f"Commit{i}", email=f"mid{i}@example.com"
+            )
+            for i in range(2)
+        ]
+
+        @connection()
+        async def create_in_two_transactions(session):
+            await TestUserRepo.create(values=users[0], session=session)
+            await session.commit()
+            await TestUserRepo.create(values=users[1], session=session)
+
+        await create_in_two_transactions()
+
+        filters = TestUserSchema(name="Mid")
+        assert len(await TestUserRepo.get_many(filters=filters)) == 2
+
+        await TestUserRepo.delete(filters=filters)
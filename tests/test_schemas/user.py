@@ -1,10 +1,16 @@
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class TestUserSchema(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     id: Optional[int] = None
     name: Optional[str] = None
     surname: Optional[str] = None
     email: Optional[str] = None
+
+
+# Неизменяемые экземпляры, общие для всех тестов
+EMPTY_USER = TestUserSchema()